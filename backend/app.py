@@ -4,17 +4,22 @@ import os
 
 from flask import Flask, jsonify
 from flask_cors import CORS
+from sqlalchemy import inspect, text
 from werkzeug.exceptions import HTTPException
 
-from extensions import db
+import auth
+from extensions import db, metrics, profiler
+from services.youtube_service import configure_guards, fetch_cache
 
 
-def create_app(testing: bool = False) -> Flask:
+def create_app(testing: bool = False, config: dict | None = None) -> Flask:
     """Create and configure the Flask application.
 
     Args:
         testing: If True, use an in-memory SQLite database instead of a
             persistent file. Defaults to False.
+        config: Optional overrides applied after the defaults (e.g.
+            ``{"METRICS_ENABLED": False}``).
 
     Returns:
         Configured Flask application instance with database tables created.
@@ -29,17 +34,52 @@ def create_app(testing: bool = False) -> Flask:
     else:
         app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["FETCH_CACHE_PATH"] = (
+        None if testing else os.path.join(app.instance_path, "fetch_cache.sqlite3")
+    )
+    app.config["FETCH_CACHE_MAX_BYTES"] = 256 * 1024 * 1024
+    app.config["UPSTREAM_RATE_PER_SECOND"] = 1.0
+    app.config["UPSTREAM_BURST"] = 5
+    app.config["UPSTREAM_FAILURE_THRESHOLD"] = 5
+    app.config["UPSTREAM_RESET_SECONDS"] = 30.0
+    app.config["METRICS_ENABLED"] = os.environ.get("SHADOWING_METRICS", "1") != "0"
+    app.config["IMPORT_BATCH_SIZE"] = 200
+    app.config["IMPORT_WORKERS"] = 4
+    app.config["IMPORT_MAX_IN_FLIGHT"] = 8
+    app.config["EVENTS_HEARTBEAT_SECONDS"] = 15.0
+    app.config["EVENTS_RETRY_MS"] = 3000
+    app.config["PROFILING_ENABLED"] = os.environ.get("SHADOWING_PROFILING", "0") == "1"
+    if config:
+        app.config.update(config)
 
     # Init extensions
     CORS(app)
     db.init_app(app)
+    metrics.init_app(app)
+    profiler.init_app(app)
+    auth.init_app(app)
+    fetch_cache.configure(app.config["FETCH_CACHE_PATH"], app.config["FETCH_CACHE_MAX_BYTES"])
+    configure_guards(
+        rate=app.config["UPSTREAM_RATE_PER_SECOND"],
+        burst=app.config["UPSTREAM_BURST"],
+        failure_threshold=app.config["UPSTREAM_FAILURE_THRESHOLD"],
+        reset_timeout=app.config["UPSTREAM_RESET_SECONDS"],
+    )
 
     # Register blueprints
     from routes.video import video_bp
     from routes.progress import progress_bp
+    from routes.sync import sync_bp
+    from routes.events import events_bp
+    from routes.imports import import_bp
+    from routes.users import users_bp
 
     app.register_blueprint(video_bp, url_prefix="/api")
     app.register_blueprint(progress_bp, url_prefix="/api")
+    app.register_blueprint(sync_bp, url_prefix="/api")
+    app.register_blueprint(events_bp, url_prefix="/api")
+    app.register_blueprint(import_bp, url_prefix="/api")
+    app.register_blueprint(users_bp, url_prefix="/api")
 
     # Global JSON error handlers
     @app.errorhandler(404)
@@ -62,10 +102,38 @@ def create_app(testing: bool = False) -> Flask:
         import models  # noqa: F401
 
         db.create_all()
+        _upgrade_schema()
 
     return app
 
 
+def _upgrade_schema() -> None:
+    """Bring tables created by older versions up to date (no migration tool).
+
+    ``create_all`` only creates missing tables, so columns and indexes
+    added to existing tables are added here, and replaced indexes dropped.
+    """
+    inspector = inspect(db.engine)
+    added_columns = {
+        "progress": "user_id INTEGER REFERENCES users(id) ON DELETE CASCADE",
+        "change_log": "user_id INTEGER REFERENCES users(id) ON DELETE CASCADE",
+    }
+    for table, column in added_columns.items():
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        if column.split()[0] not in existing:
+            db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {column}"))
+    # Superseded by composite indexes with the same leading column
+    for index in ("ix_change_log_video_id",):
+        db.session.execute(text(f"DROP INDEX IF EXISTS {index}"))
+    db.session.commit()
+
+    from models import ChangeLog, Progress
+
+    for model in (Progress, ChangeLog):
+        for index in model.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
 if __name__ == "__main__":
     app = create_app()
     app.run(debug=True, port=5001)
@@ -0,0 +1,64 @@
+"""Optional bearer-token authentication for multi-user deployments.
+
+Requests without an ``Authorization`` header behave exactly as before
+users existed: they read and write the global, single-user view (progress
+and change-log rows with ``user_id`` NULL). A valid ``Bearer`` token
+scopes progress, the library, sync and events to that user; an invalid
+token is rejected with 401 rather than silently falling back.
+"""
+
+import hashlib
+import secrets
+
+from flask import Flask, Response, g, jsonify, request
+from sqlalchemy import ColumnElement, select
+
+from extensions import db
+from models import User
+
+
+def generate_token() -> str:
+    """Return a new random bearer token (shown to the user once)."""
+    return secrets.token_urlsafe(32)
+
+
+def hash_token(token: str) -> str:
+    """Return the SHA-256 hex digest stored in ``users.token_hash``."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def current_user_id() -> int | None:
+    """Return the authenticated user's ID, or None for anonymous requests."""
+    return g.get("user_id")
+
+
+def user_filter(column, user_id: int | None) -> ColumnElement[bool]:
+    """Match rows owned by ``user_id`` (``IS NULL`` for the global view)."""
+    return column.is_(None) if user_id is None else column == user_id
+
+
+def _load_user() -> tuple[Response, int] | None:
+    """Resolve the bearer token (if any) to ``g.user_id``."""
+    g.user_id = None
+    if "Authorization" not in request.headers:
+        return None
+
+    credentials = request.authorization
+    if credentials is None or credentials.type != "bearer" or not credentials.token:
+        return _unauthorized()
+    user_id = db.session.scalar(
+        select(User.id).where(User.token_hash == hash_token(credentials.token))
+    )
+    if user_id is None:
+        return _unauthorized()
+    g.user_id = user_id
+    return None
+
+
+def _unauthorized() -> tuple[Response, int]:
+    return jsonify({"error": "Invalid bearer token", "error_code": "INVALID_TOKEN"}), 401
+
+
+def init_app(app: Flask) -> None:
+    """Authenticate every request before it reaches a view."""
+    app.before_request(_load_user)
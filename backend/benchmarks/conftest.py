@@ -0,0 +1,219 @@
+"""Fixtures and baseline checking for the backend benchmark suite.
+
+Run with ``uv run pytest benchmarks`` from ``backend/``. Each benchmark
+records the median latency and the number of SQL statements issued per
+call, and compares them with ``baselines.json``:
+
+* more SQL statements than the baseline fails the run (query counts are
+  deterministic, so any increase is a regression such as a new N+1);
+* a median latency above ``baseline * BENCH_TOLERANCE`` (default 2.0)
+  fails the run.
+
+Pass ``--update-baselines`` to rewrite ``baselines.json`` from the current
+run. Library size is controlled by ``BENCH_VIDEOS`` and ``BENCH_PROGRESS``;
+baselines are only enforced when they match the recorded scale. The
+multi-user load test (marked ``load_scale``) is sized by ``BENCH_USERS``
+and ``BENCH_LEARNERS`` and recorded under its own scale, so changing it
+never invalidates the other baselines.
+"""
+
+import json
+import os
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from app import create_app
+from extensions import db as _db
+
+from benchmarks.generators import make_transcript, populate_library
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+SCALE = {
+    "videos": int(os.environ.get("BENCH_VIDEOS", "1000")),
+    "progress_per_video": int(os.environ.get("BENCH_PROGRESS", "100")),
+    "transcript_seconds": int(os.environ.get("BENCH_TRANSCRIPT_SECONDS", "10800")),
+}
+LOAD_SCALE = {
+    "users": int(os.environ.get("BENCH_USERS", "1000")),
+    "learners": int(os.environ.get("BENCH_LEARNERS", "32")),
+}
+# baselines.json key of each scale; a benchmark's entry names its scale
+# unless it is the default "scale"
+SCALES = {"scale": SCALE, "load_scale": LOAD_SCALE}
+TOLERANCE = float(os.environ.get("BENCH_TOLERANCE", "2.0"))
+
+_results: dict[str, dict] = {}
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "load_scale: benchmark sized by BENCH_USERS/BENCH_LEARNERS"
+    )
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--update-baselines",
+        action="store_true",
+        default=False,
+        help="Rewrite benchmarks/baselines.json from this run.",
+    )
+
+
+def _load_baselines() -> dict:
+    if BASELINES_PATH.exists():
+        return json.loads(BASELINES_PATH.read_text())
+    return {**SCALES, "benchmarks": {}}
+
+
+def _scale_key(baseline: dict) -> str:
+    return baseline.get("scale", "scale")
+
+
+@pytest.fixture(scope="module")
+def bench_app() -> Flask:
+    """A fresh in-memory app per benchmark module (metrics off)."""
+    return create_app(testing=True, config={"METRICS_ENABLED": False})
+
+
+@pytest.fixture(scope="module")
+def bench_client(bench_app: Flask) -> FlaskClient:
+    return bench_app.test_client()
+
+
+@pytest.fixture(scope="module")
+def bench_db(bench_app: Flask):
+    with bench_app.app_context():
+        yield _db
+
+
+@pytest.fixture(scope="module")
+def large_library(bench_db) -> list[str]:
+    """A library of ``BENCH_VIDEOS`` videos with ``BENCH_PROGRESS`` rows each."""
+    return populate_library(
+        bench_db, SCALE["videos"], progress_per_video=SCALE["progress_per_video"]
+    )
+
+
+@pytest.fixture(scope="module")
+def long_transcript() -> list[dict]:
+    """A multi-hour transcript (``BENCH_TRANSCRIPT_SECONDS``, default 3 h)."""
+    return make_transcript(SCALE["transcript_seconds"])
+
+
+class _QueryCounter:
+    """Counts SQL statements executed on an engine while active."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args) -> None:
+        self.count += 1
+
+
+@pytest.fixture()
+def record_benchmark(request: pytest.FixtureRequest) -> Callable:
+    """Record an externally measured result and check it against baselines.
+
+    Returns:
+        ``record(name, median_ms, queries=0)``.
+    """
+    update = request.config.getoption("--update-baselines")
+    load_scale = request.node.get_closest_marker("load_scale") is not None
+
+    def record(name: str, median_ms: float, queries: int = 0) -> dict:
+        result = {"median_ms": round(median_ms, 3), "queries": queries}
+        if load_scale:
+            result["scale"] = "load_scale"
+        _results[name] = result
+        if not update:
+            _check_baseline(name, result)
+        return result
+
+    return record
+
+
+@pytest.fixture()
+def bench(bench_db, record_benchmark: Callable) -> Callable:
+    """Run a callable repeatedly, record latency + SQL counts, check baselines.
+
+    Returns:
+        ``run(name, fn, setup=None, rounds=5)``. ``setup`` (if given) runs
+        before every round and is excluded from both timing and query
+        counting. ``fn`` must return a Flask response with status < 400.
+    """
+    engine = bench_db.engine
+
+    def run(name: str, fn: Callable, setup: Callable | None = None, rounds: int = 5) -> dict:
+        timings = []
+        queries = []
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+            counter = _QueryCounter()
+            event.listen(engine, "before_cursor_execute", counter)
+            try:
+                start = time.perf_counter()
+                resp = fn()
+                timings.append(time.perf_counter() - start)
+            finally:
+                event.remove(engine, "before_cursor_execute", counter)
+            assert resp.status_code < 400, resp.get_data(as_text=True)
+            queries.append(counter.count)
+
+        return record_benchmark(name, statistics.median(timings) * 1000, max(queries))
+
+    return run
+
+
+def _check_baseline(name: str, result: dict) -> None:
+    baselines = _load_baselines()
+    key = _scale_key(result)
+    if baselines.get(key) != SCALES[key]:
+        return
+    baseline = baselines["benchmarks"].get(name)
+    if baseline is None:
+        pytest.fail(f"No baseline for '{name}'; run with --update-baselines")
+    if result["queries"] > baseline["queries"]:
+        pytest.fail(
+            f"{name}: {result['queries']} SQL statements per call "
+            f"(baseline {baseline['queries']})"
+        )
+    limit = baseline["median_ms"] * TOLERANCE
+    if result["median_ms"] > limit:
+        pytest.fail(
+            f"{name}: median {result['median_ms']:.1f} ms exceeds "
+            f"{limit:.1f} ms (baseline {baseline['median_ms']:.1f} ms x {TOLERANCE})"
+        )
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    if not _results or not session.config.getoption("--update-baselines"):
+        return
+    baselines = _load_baselines()
+    benchmarks = baselines["benchmarks"]
+    for key, scale in SCALES.items():
+        # Baselines recorded at another scale can't be compared any more
+        if baselines.get(key) != scale:
+            benchmarks = {n: b for n, b in benchmarks.items() if _scale_key(b) != key}
+    benchmarks.update(_results)
+    baselines = {**SCALES, "benchmarks": dict(sorted(benchmarks.items()))}
+    BASELINES_PATH.write_text(json.dumps(baselines, indent=2) + "\n")
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    if not _results:
+        return
+    terminalreporter.section("benchmark results")
+    for name, result in sorted(_results.items()):
+        terminalreporter.write_line(
+            f"{name:<40} {result['median_ms']:>10.3f} ms  {result['queries']:>6} queries"
+        )
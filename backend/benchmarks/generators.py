@@ -0,0 +1,205 @@
+"""Synthetic data generators for backend benchmarks.
+
+Rows are written with Core ``INSERT`` executemany batches so building a
+library of thousands of videos takes seconds rather than minutes.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert
+
+from auth import hash_token
+from models import ChangeLog, Progress, User, UserVideo, Video
+
+WORDS = (
+    "so today we are going to talk about how language learning really works "
+    "and why listening and speaking every day makes such a big difference"
+).split()
+
+
+def make_video_id(index: int) -> str:
+    """Return a deterministic 11-character video ID for ``index``."""
+    return f"bench{index:06d}"
+
+
+def make_transcript(duration_seconds: int, segment_seconds: float = 2.5, seed: int = 0) -> list[dict]:
+    """Build a transcript covering ``duration_seconds`` of speech.
+
+    Args:
+        duration_seconds: Total transcript length in seconds (e.g. 3 hours
+            is ``10_800``).
+        segment_seconds: Length of each caption fragment.
+        seed: Seed for the word generator, for reproducible text.
+
+    Returns:
+        A list of ``{"start", "duration", "text"}`` dicts matching the
+        shape produced by ``fetch_transcript``.
+    """
+    rng = random.Random(seed)
+    count = int(duration_seconds / segment_seconds)
+    return [
+        {
+            "start": round(i * segment_seconds, 2),
+            "duration": segment_seconds,
+            "text": " ".join(rng.choice(WORDS) for _ in range(8)),
+        }
+        for i in range(count)
+    ]
+
+
+def populate_library(
+    db: SQLAlchemy,
+    n_videos: int,
+    progress_per_video: int = 100,
+    transcript_seconds: int = 60,
+) -> list[str]:
+    """Insert ``n_videos`` videos, each with ``progress_per_video`` entries.
+
+    Args:
+        db: The SQLAlchemy instance (inside an app context).
+        n_videos: Number of videos to create.
+        progress_per_video: Progress rows per video.
+        transcript_seconds: Transcript length stored on every video.
+
+    Returns:
+        The generated video IDs, in insertion order.
+    """
+    transcript = make_transcript(transcript_seconds)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    video_ids = [make_video_id(i) for i in range(n_videos)]
+
+    db.session.execute(insert(Video), [
+        {
+            "video_id": vid,
+            "title": f"Benchmark video {i}",
+            "duration": transcript_seconds,
+            "thumbnail": f"https://img.youtube.com/{vid}.jpg",
+            "transcript_json": transcript,
+            "created_at": base + timedelta(minutes=i),
+        }
+        for i, vid in enumerate(video_ids)
+    ])
+
+    batch: list[dict] = []
+    for i, vid in enumerate(video_ids):
+        for n in range(progress_per_video):
+            batch.append({
+                "video_id": vid,
+                "round": n // 5 + 1,
+                "step": n % 5 + 1,
+                "notes": None,
+                "created_at": base + timedelta(days=i % 365, minutes=n),
+            })
+        if len(batch) >= 10_000:
+            db.session.execute(insert(Progress), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(Progress), batch)
+
+    db.session.commit()
+    return video_ids
+
+
+def make_token(index: int) -> str:
+    """Return the deterministic bearer token of generated user ``index``."""
+    return f"bench-token-{index:06d}"
+
+
+def populate_users(
+    db: SQLAlchemy,
+    n_users: int,
+    video_ids: list[str],
+    library_size: int = 20,
+    progress_per_video: int = 5,
+) -> list[tuple[str, list[str]]]:
+    """Insert ``n_users`` users, each with a library and progress history.
+
+    Libraries are overlapping windows of ``video_ids``, so videos are
+    shared between users as in a real deployment.
+
+    Args:
+        db: The SQLAlchemy instance (inside an app context).
+        n_users: Number of users to create.
+        video_ids: Stored videos to build libraries from.
+        library_size: Videos per user library.
+        progress_per_video: Progress rows per user and library video.
+
+    Returns:
+        ``(token, library_video_ids)`` per user, in user ID order.
+    """
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    db.session.execute(insert(User), [
+        {"id": i + 1, "name": f"Learner {i}", "token_hash": hash_token(make_token(i)),
+         "created_at": base}
+        for i in range(n_users)
+    ])
+
+    users = []
+    memberships: list[dict] = []
+    progress: list[dict] = []
+    for i in range(n_users):
+        library = [video_ids[(i + k) % len(video_ids)] for k in range(library_size)]
+        users.append((make_token(i), library))
+        for k, vid in enumerate(library):
+            memberships.append({"user_id": i + 1, "video_id": vid, "added_at": base})
+            for n in range(progress_per_video):
+                progress.append({
+                    "video_id": vid,
+                    "user_id": i + 1,
+                    "round": n + 1,
+                    "step": 1,
+                    "notes": None,
+                    "created_at": base + timedelta(days=k, minutes=n),
+                })
+        if len(progress) >= 10_000:
+            db.session.execute(insert(UserVideo), memberships)
+            db.session.execute(insert(Progress), progress)
+            memberships, progress = [], []
+    if memberships:
+        db.session.execute(insert(UserVideo), memberships)
+    if progress:
+        db.session.execute(insert(Progress), progress)
+
+    db.session.commit()
+    return users
+
+
+def populate_changelog(
+    db: SQLAlchemy,
+    video_ids: list[str],
+    progress_per_video: int = 18,
+    delete_every: int = 4,
+) -> int:
+    """Append a change-log history for ``video_ids`` (global view).
+
+    Each video gets an insert followed by ``progress_per_video`` progress
+    inserts; every ``delete_every``-th video is then deleted, leaving its
+    entries for compaction to drop. Entries are recent, so none expire.
+
+    Args:
+        db: The SQLAlchemy instance (inside an app context).
+        video_ids: Videos the history refers to.
+        progress_per_video: Progress inserts logged per video.
+        delete_every: Log a delete for every n-th video.
+
+    Returns:
+        The number of entries written.
+    """
+    now = datetime.now(timezone.utc)
+    rows: list[dict] = []
+    for i, vid in enumerate(video_ids):
+        rows.append({"entity": "video", "op": "insert", "entity_id": vid,
+                     "video_id": vid, "user_id": None, "created_at": now})
+        rows.extend(
+            {"entity": "progress", "op": "insert", "entity_id": str(i * progress_per_video + n),
+             "video_id": vid, "user_id": None, "created_at": now}
+            for n in range(progress_per_video)
+        )
+        if i % delete_every == 0:
+            rows.append({"entity": "video", "op": "delete", "entity_id": vid,
+                         "video_id": vid, "user_id": None, "created_at": now})
+    db.session.execute(insert(ChangeLog), rows)
+    db.session.commit()
+    return len(rows)
@@ -0,0 +1,67 @@
+"""Benchmarks for the library endpoints (list, get, delete)."""
+
+from sqlalchemy import insert
+
+from models import Progress, Video
+
+from benchmarks.conftest import SCALE
+
+
+def test_list_videos(bench, bench_client, large_library):
+    bench("list_videos", lambda: bench_client.get("/api/videos"))
+
+
+def test_get_video_long_transcript(bench, bench_client, bench_db, long_transcript):
+    bench_db.session.add(Video(
+        video_id="longvideo01",
+        title="Three hour lecture",
+        duration=SCALE["transcript_seconds"],
+        transcript_json=long_transcript,
+    ))
+    bench_db.session.commit()
+
+    bench("get_video_long_transcript", lambda: bench_client.get("/api/video/longvideo01"))
+
+
+def test_delete_video_with_progress(bench, bench_client, bench_db, large_library):
+    video_id = "delvideo001"
+
+    bench(
+        "delete_video_with_progress",
+        lambda: bench_client.delete(f"/api/video/{video_id}"),
+        setup=lambda: _insert_videos_with_progress(
+            bench_db, [video_id], SCALE["progress_per_video"]
+        ),
+    )
+
+
+def _insert_videos_with_progress(db, video_ids, progress_per_video):
+    db.session.execute(insert(Video), [
+        {"video_id": vid, "title": vid, "duration": 60, "transcript_json": []}
+        for vid in video_ids
+    ])
+    db.session.execute(insert(Progress), [
+        {"video_id": vid, "round": n // 5 + 1, "step": n % 5 + 1}
+        for vid in video_ids
+        for n in range(progress_per_video)
+    ])
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def test_delete_video_thousands_of_progress(bench, bench_client, bench_db, large_library):
+    video_id = "delheavy001"
+    bench(
+        "delete_video_5000_progress",
+        lambda: bench_client.delete(f"/api/video/{video_id}"),
+        setup=lambda: _insert_videos_with_progress(bench_db, [video_id], 5000),
+    )
+
+
+def test_bulk_delete_videos(bench, bench_client, bench_db, large_library):
+    video_ids = [f"bulk{i:07d}" for i in range(50)]
+    bench(
+        "bulk_delete_50_videos",
+        lambda: bench_client.delete("/api/videos", json={"video_ids": video_ids}),
+        setup=lambda: _insert_videos_with_progress(bench_db, video_ids, 100),
+    )
@@ -0,0 +1,17 @@
+"""Benchmarks for the progress endpoints."""
+
+
+def test_get_progress(bench, bench_client, large_library):
+    video_id = large_library[len(large_library) // 2]
+    bench("get_progress", lambda: bench_client.get(f"/api/progress/{video_id}"))
+
+
+def test_create_progress(bench, bench_client, large_library):
+    video_id = large_library[0]
+    bench(
+        "create_progress",
+        lambda: bench_client.post(
+            "/api/progress", json={"video_id": video_id, "round": 21, "step": 1}
+        ),
+        rounds=20,
+    )
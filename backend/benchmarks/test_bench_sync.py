@@ -0,0 +1,44 @@
+"""Benchmarks for change-log compaction at a realistic log size."""
+
+import statistics
+import time
+
+import pytest
+from sqlalchemy import event
+
+from services.changelog import compact_changelog
+
+from benchmarks.conftest import SCALE
+from benchmarks.generators import make_video_id, populate_changelog
+
+ROUNDS = 5
+
+
+@pytest.fixture(scope="module")
+def changelog_entries(bench_db) -> int:
+    """About 20 entries per ``BENCH_VIDEOS`` video (~20k), a quarter deleted."""
+    video_ids = [make_video_id(i) for i in range(SCALE["videos"])]
+    return populate_changelog(bench_db, video_ids)
+
+
+def test_compact_changelog(record_benchmark, bench_db, changelog_entries):
+    timings = []
+    statements = []
+
+    def count(*args):
+        statements.append(None)
+
+    for _ in range(ROUNDS):
+        statements.clear()
+        event.listen(bench_db.engine, "before_cursor_execute", count)
+        try:
+            start = time.perf_counter()
+            removed = compact_changelog()
+            timings.append(time.perf_counter() - start)
+        finally:
+            event.remove(bench_db.engine, "before_cursor_execute", count)
+        assert removed > 0
+        # Every round compacts the same log
+        bench_db.session.rollback()
+
+    record_benchmark("compact_changelog", statistics.median(timings) * 1000, len(statements))
@@ -0,0 +1,101 @@
+"""Multi-user load test: many learners logging rounds concurrently.
+
+Runs against a file-backed SQLite database (WAL mode, real connection
+pool) rather than the in-memory one, so concurrent writers contend the
+way they do in a shared deployment.
+"""
+
+import statistics
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from app import create_app
+
+from benchmarks.conftest import LOAD_SCALE
+from benchmarks.generators import populate_library, populate_users
+
+pytestmark = pytest.mark.load_scale
+
+SHARED_VIDEOS = 200
+ROUNDS_PER_LEARNER = 20
+
+
+@pytest.fixture(scope="module")
+def bench_app(tmp_path_factory) -> Flask:
+    """Overrides the in-memory app with a file-backed one for this module."""
+    path = tmp_path_factory.mktemp("load") / "shadowing.db"
+    return create_app(
+        testing=True,
+        config={"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "METRICS_ENABLED": False},
+    )
+
+
+@pytest.fixture(scope="module")
+def learners(bench_db) -> list[tuple[str, list[str]]]:
+    """``BENCH_USERS`` users with 20-video libraries over 200 shared videos."""
+    video_ids = populate_library(bench_db, SHARED_VIDEOS, progress_per_video=0)
+    return populate_users(bench_db, LOAD_SCALE["users"], video_ids)
+
+
+def test_list_videos_per_user(bench, bench_client, learners):
+    token, _ = learners[len(learners) // 2]
+    headers = {"Authorization": f"Bearer {token}"}
+    bench("list_videos_per_user", lambda: bench_client.get("/api/videos", headers=headers))
+
+
+def test_get_progress_per_user(bench, bench_client, learners):
+    token, library = learners[len(learners) // 2]
+    headers = {"Authorization": f"Bearer {token}"}
+    bench(
+        "get_progress_per_user",
+        lambda: bench_client.get(f"/api/progress/{library[0]}", headers=headers),
+    )
+
+
+def test_concurrent_learners(bench_app, learners, record_benchmark):
+    """``BENCH_LEARNERS`` threads each log rounds and refresh their library."""
+    log_timings: list[float] = []
+    list_timings: list[float] = []
+    failures: list[str] = []
+    lock = threading.Lock()
+    start = threading.Barrier(LOAD_SCALE["learners"])
+
+    def learner(token: str, library: list[str]) -> None:
+        client = bench_app.test_client()
+        headers = {"Authorization": f"Bearer {token}"}
+        logs, lists = [], []
+        start.wait()
+        for n in range(ROUNDS_PER_LEARNER):
+            body = {"video_id": library[n % len(library)], "round": n + 1, "step": 1}
+            t0 = time.perf_counter()
+            resp = client.post("/api/progress", json=body, headers=headers)
+            logs.append(time.perf_counter() - t0)
+            if resp.status_code != 201:
+                failures.append(resp.get_data(as_text=True))
+
+            t0 = time.perf_counter()
+            resp = client.get("/api/videos", headers=headers)
+            lists.append(time.perf_counter() - t0)
+            if resp.status_code != 200:
+                failures.append(resp.get_data(as_text=True))
+        with lock:
+            log_timings.extend(logs)
+            list_timings.extend(lists)
+
+    stride = max(1, len(learners) // LOAD_SCALE["learners"])
+    threads = [
+        threading.Thread(target=learner, args=learners[i * stride])
+        for i in range(LOAD_SCALE["learners"])
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not failures, failures[:3]
+    # Medians only: tail latencies under write contention are too noisy to baseline
+    record_benchmark("concurrent_learners_log_round", statistics.median(log_timings) * 1000)
+    record_benchmark("concurrent_learners_list_videos", statistics.median(list_timings) * 1000)
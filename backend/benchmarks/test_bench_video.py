@@ -0,0 +1,47 @@
+"""Benchmarks for POST /api/video with stubbed YouTube services."""
+
+from unittest.mock import patch
+
+from models import Video
+
+
+def test_create_video_cold(bench, bench_client, bench_db, long_transcript):
+    metadata = {
+        "video_id": "coldvideo01",
+        "title": "Cold fetch",
+        "duration": 10_800,
+        "thumbnail": "https://img.youtube.com/cold.jpg",
+    }
+
+    def setup():
+        bench_db.session.query(Video).filter_by(video_id="coldvideo01").delete()
+        bench_db.session.commit()
+
+    with patch("routes.video.fetch_video_metadata", return_value=metadata), \
+            patch("routes.video.fetch_transcript", return_value=long_transcript):
+        bench(
+            "create_video_cold",
+            lambda: bench_client.post(
+                "/api/video", json={"url": "https://youtu.be/coldvideo01"}
+            ),
+            setup=setup,
+        )
+
+
+def test_create_video_cached(bench, bench_client, bench_db, long_transcript):
+    bench_db.session.add(Video(
+        video_id="warmvideo01",
+        title="Cached",
+        duration=10_800,
+        transcript_json=long_transcript,
+    ))
+    bench_db.session.commit()
+
+    with patch("routes.video.fetch_video_metadata") as mock_metadata:
+        bench(
+            "create_video_cached",
+            lambda: bench_client.post(
+                "/api/video", json={"url": "https://youtu.be/warmvideo01"}
+            ),
+        )
+        mock_metadata.assert_not_called()
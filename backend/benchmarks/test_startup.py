@@ -0,0 +1,56 @@
+"""Startup-time benchmark: ``create_app`` must not import yt-dlp eagerly.
+
+Runs a fresh interpreter under ``python -X importtime`` so module caching
+in the test process can't hide regressions.
+"""
+
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Heavy upstream libraries that only a cold POST /api/video may import
+DEFERRED_MODULES = ("yt_dlp", "youtube_transcript_api", "requests")
+
+
+def _import_profile() -> tuple[float, set[str]]:
+    """Return (total import time in ms, imported module names) for app startup."""
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "from app import create_app; create_app(testing=True)",
+        ],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        # Top-level entries (no indentation) sum to the whole import cost
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def test_startup_defers_upstream_libraries():
+    _, modules = _import_profile()
+    eager = sorted(
+        m for m in modules if m.split(".")[0] in DEFERRED_MODULES
+    )
+    assert eager == [], f"imported at startup: {eager[:10]}"
+
+
+def test_startup_import_time(record_benchmark):
+    timings = [_import_profile()[0] for _ in range(3)]
+    record_benchmark("startup_import_time", statistics.median(timings))
@@ -1,5 +1,29 @@
 """Shared Flask extensions (single instances, survive debug reloader)."""
 
+import sqlite3
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from metrics import Metrics
+from profiling import RequestProfiler
 
 db = SQLAlchemy()
+metrics = Metrics()
+profiler = RequestProfiler()
+
+
+@event.listens_for(Engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+    """Turn on FK enforcement (and ``ON DELETE CASCADE``) for SQLite connections.
+
+    File databases also switch to write-ahead logging, so concurrent
+    learners' reads don't wait on each other's progress writes (a no-op
+    for in-memory databases).
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
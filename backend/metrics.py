@@ -0,0 +1,309 @@
+"""Request, SQL, upstream and cache instrumentation in Prometheus text format.
+
+All state lives in a single in-process :class:`Metrics` registry. When
+``METRICS_ENABLED`` is False no hooks are registered and every ``record_*``
+helper returns immediately, so instrumented code paths cost one attribute
+check.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+
+# Latency buckets (seconds) shared by request, SQL and upstream histograms
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Per-request SQL statement counts — wide enough to expose N+1 patterns
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    """Render a Prometheus label set, e.g. ``{endpoint="x",method="GET"}``."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: object) -> str:
+    """Escape a label value per the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...], buckets: tuple) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, label_values: tuple, value: float) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            # [bucket counts..., sum, count]
+            series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self._series.items()):
+            names = self.labels + ("le",)
+            for bound, count in zip(self.buckets, series):
+                labels = _format_labels(names, label_values + (repr(float(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(names, label_values + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            base = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{base} {series[-2]}")
+            lines.append(f"{self.name}_count{base} {series[-1]}")
+        return lines
+
+
+class _Counter:
+    """Monotonic counter keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._series: dict[tuple, float] = {}
+
+    def inc(self, label_values: tuple, amount: float = 1) -> None:
+        self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self._series.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class _Gauge:
+    """Gauge whose series are read from a callback at render time."""
+
+    def __init__(
+        self, name: str, help_text: str, labels: tuple[str, ...], collect: Callable[[], dict]
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for label_values, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Metrics:
+    """In-process metrics registry wired into Flask and SQLAlchemy.
+
+    Usage mirrors other Flask extensions: create one instance in
+    ``extensions.py`` and call :meth:`init_app` from the app factory.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._gauges: list[_Gauge] = []
+        self._reset_series()
+
+    def _reset_series(self) -> None:
+        self.request_duration = _Histogram(
+            "shadowing_request_duration_seconds",
+            "HTTP request latency by endpoint.",
+            ("endpoint", "method", "status"),
+            LATENCY_BUCKETS,
+        )
+        self.request_queries = _Histogram(
+            "shadowing_request_sql_queries",
+            "Number of SQL statements issued per HTTP request.",
+            ("endpoint", "method"),
+            QUERY_COUNT_BUCKETS,
+        )
+        self.request_sql_duration = _Histogram(
+            "shadowing_request_sql_duration_seconds",
+            "Total time spent in SQL per HTTP request.",
+            ("endpoint", "method"),
+            LATENCY_BUCKETS,
+        )
+        self.query_duration = _Histogram(
+            "shadowing_sql_query_duration_seconds",
+            "Latency of individual SQL statements.",
+            ("operation",),
+            LATENCY_BUCKETS,
+        )
+        self.upstream_duration = _Histogram(
+            "shadowing_upstream_fetch_duration_seconds",
+            "Latency of upstream YouTube fetches.",
+            ("operation", "outcome"),
+            LATENCY_BUCKETS,
+        )
+        self.cache_requests = _Counter(
+            "shadowing_cache_requests_total",
+            "Cache lookups by cache name and result (hit/miss).",
+            ("cache", "result"),
+        )
+        self.upstream_rejections = _Counter(
+            "shadowing_upstream_rejections_total",
+            "Upstream calls rejected without a network request, by reason.",
+            ("operation", "reason"),
+        )
+
+    def reset(self) -> None:
+        """Drop all recorded series (used by tests and benchmarks)."""
+        with self._lock:
+            self._reset_series()
+
+    def init_app(self, app: Flask) -> None:
+        """Register request hooks, SQL listeners and the ``/api/metrics`` route.
+
+        Args:
+            app: The Flask application. Reads ``METRICS_ENABLED`` (default
+                True); when False nothing is registered.
+        """
+        self.enabled = app.config.setdefault("METRICS_ENABLED", True)
+        if not self.enabled:
+            return
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.add_url_rule("/api/metrics", "metrics", self._export_view, methods=["GET"])
+
+        from extensions import db
+
+        with app.app_context():
+            event.listen(db.engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(db.engine, "after_cursor_execute", self._after_cursor_execute)
+
+    # -- Flask hooks ---------------------------------------------------------
+
+    def _start_request(self) -> None:
+        g._metrics_start = time.perf_counter()
+        g._metrics_sql_count = 0
+        g._metrics_sql_time = 0.0
+
+    def _finish_request(self, response: Response) -> Response:
+        start = g.pop("_metrics_start", None)
+        if start is None or not self.enabled:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or "unmatched"
+        method = request.method
+        with self._lock:
+            self.request_duration.observe((endpoint, method, str(response.status_code)), elapsed)
+            self.request_queries.observe((endpoint, method), g.get("_metrics_sql_count", 0))
+            self.request_sql_duration.observe((endpoint, method), g.get("_metrics_sql_time", 0.0))
+        return response
+
+    # -- SQLAlchemy hooks ----------------------------------------------------
+
+    # The start time lives on the per-statement execution context rather than
+    # the pooled connection, so a statement that raises (and never reaches
+    # after_cursor_execute) leaves nothing behind
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        start = getattr(context, "_metrics_start", None)
+        if start is None or not self.enabled:
+            return
+        elapsed = time.perf_counter() - start
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        with self._lock:
+            self.query_duration.observe((operation,), elapsed)
+        if has_request_context() and "_metrics_sql_count" in g:
+            g._metrics_sql_count += 1
+            g._metrics_sql_time += elapsed
+
+    # -- Instrumentation helpers ---------------------------------------------
+
+    def time_upstream(self, operation: str):
+        """Context manager timing an upstream fetch, labelled by outcome.
+
+        Args:
+            operation: Short name of the upstream call (e.g. ``"metadata"``).
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._time_upstream(operation)
+
+    @contextmanager
+    def _time_upstream(self, operation: str) -> Iterator[None]:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.upstream_duration.observe((operation, outcome), elapsed)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """Count a cache lookup for hit-rate reporting.
+
+        Args:
+            cache: Cache name (e.g. ``"video_db"``).
+            hit: Whether the lookup was served from the cache.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.cache_requests.inc((cache, "hit" if hit else "miss"))
+
+    def record_upstream_rejection(self, operation: str, reason: str) -> None:
+        """Count an upstream call rejected by the rate limiter or circuit breaker."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.upstream_rejections.inc((operation, reason))
+
+    def register_gauge(
+        self, name: str, help_text: str, labels: tuple[str, ...], collect: Callable[[], dict]
+    ) -> None:
+        """Export a gauge whose values are read from ``collect`` on every scrape.
+
+        Args:
+            name: Metric name.
+            help_text: Prometheus HELP text.
+            labels: Label names.
+            collect: Returns ``{label_values_tuple: value}``.
+        """
+        self._gauges.append(_Gauge(name, help_text, labels, collect))
+
+    # -- Export --------------------------------------------------------------
+
+    def render(self) -> str:
+        """Return all series in the Prometheus text exposition format."""
+        with self._lock:
+            lines: list[str] = []
+            for metric in (
+                self.request_duration,
+                self.request_queries,
+                self.request_sql_duration,
+                self.query_duration,
+                self.upstream_duration,
+                self.cache_requests,
+                self.upstream_rejections,
+                *self._gauges,
+            ):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _export_view(self) -> Response:
+        return Response(self.render(), mimetype="text/plain; version=0.0.4")
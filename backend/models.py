@@ -24,19 +24,64 @@ class Video(db.Model):
     )
 
 
+class User(db.Model):
+    """A learner authenticated with a locally issued bearer token.
+
+    Only a SHA-256 hash of the token is stored; the token itself is shown
+    once, when the user is created.
+    """
+
+    __tablename__ = "users"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    name = db.Column(db.String(100), nullable=False)
+    token_hash = db.Column(db.String(64), nullable=False, unique=True)
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class UserVideo(db.Model):
+    """Membership of a shared, de-duplicated video in a user's library."""
+
+    __tablename__ = "user_videos"
+
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    video_id = db.Column(
+        db.String(20),
+        db.ForeignKey("videos.video_id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    added_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+
 class Progress(db.Model):
     """A single shadowing practice entry linked to a video.
 
     Tracks which round and step the user has reached for a given video,
-    along with optional free-text notes.
+    along with optional free-text notes. ``user_id`` is NULL for entries
+    logged without authentication (single-user deployments).
     """
 
     __tablename__ = "progress"
+    # Serves per-user history and "latest entry per video" lookups
+    __table_args__ = (
+        db.Index("ix_progress_user_video_created", "user_id", "video_id", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     video_id = db.Column(
-        db.String(20), db.ForeignKey("videos.video_id"), nullable=False
+        db.String(20),
+        db.ForeignKey("videos.video_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"))
     round = db.Column(db.Integer, nullable=False)
     step = db.Column(db.Integer, nullable=False)
     notes = db.Column(db.Text)
@@ -44,6 +89,98 @@ class Progress(db.Model):
         db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
     )
 
+    # passive_deletes: let the database cascade instead of loading every row
     video = db.relationship(
-        "Video", backref=db.backref("progress_entries", lazy=True, cascade="all, delete-orphan")
+        "Video",
+        backref=db.backref(
+            "progress_entries", lazy=True, cascade="all, delete-orphan", passive_deletes=True
+        ),
+    )
+
+
+class Transcript(db.Model):
+    """A transcript of a cached video in one language.
+
+    The primary (English) transcript lives on ``Video.transcript_json``;
+    rows here hold additional languages fetched or translated on demand,
+    so each language is fetched from YouTube only once.
+    """
+
+    __tablename__ = "transcripts"
+
+    video_id = db.Column(
+        db.String(20),
+        db.ForeignKey("videos.video_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    language = db.Column(db.String(16), primary_key=True)
+    segments_json = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
     )
+
+
+class TranscriptSegmentation(db.Model):
+    """Sentence-level segments and practice chunks derived from a transcript.
+
+    Computed once (when the video is fetched, or on first request for a
+    translated language) so clients don't re-derive shadowing units.
+    """
+
+    __tablename__ = "transcript_segmentations"
+
+    video_id = db.Column(
+        db.String(20),
+        db.ForeignKey("videos.video_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    language = db.Column(db.String(16), primary_key=True)
+    sentences_json = db.Column(db.JSON, nullable=False)
+    chunks_json = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class ChangeLog(db.Model):
+    """One insert/delete of a video or progress entry, for delta sync.
+
+    ``seq`` is strictly increasing (SQLite ``AUTOINCREMENT`` never reuses
+    values), so a client only needs to remember the last ``seq`` it applied.
+    Entries are scoped to one user, or to the global view when ``user_id``
+    is NULL.
+    """
+
+    __tablename__ = "change_log"
+    __table_args__ = (
+        db.Index("ix_change_log_user_seq", "user_id", "seq"),
+        # Compaction looks up each entity's / video's deletes per user
+        db.Index("ix_change_log_entity_user_seq", "entity", "entity_id", "user_id", "seq"),
+        db.Index("ix_change_log_video_user_seq", "video_id", "user_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    entity = db.Column(db.String(16), nullable=False)
+    op = db.Column(db.String(8), nullable=False)
+    entity_id = db.Column(db.String(32), nullable=False)
+    video_id = db.Column(db.String(20), nullable=False)
+    # Whose library/progress changed; NULL for the unauthenticated global view
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"))
+    payload = db.Column(db.JSON)
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class SyncCheckpoint(db.Model):
+    """Single-row record of how far the change log has been truncated.
+
+    Clients whose last ``seq`` is older than ``truncated_through`` missed
+    changes that no longer exist and must re-fetch everything.
+    """
+
+    __tablename__ = "sync_checkpoint"
+
+    id = db.Column(db.Integer, primary_key=True)
+    truncated_through = db.Column(db.Integer, nullable=False, default=0)
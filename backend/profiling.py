@@ -0,0 +1,215 @@
+"""Opt-in per-request profiling with SQL ``EXPLAIN QUERY PLAN`` capture.
+
+When ``PROFILING_ENABLED`` is True, any request carrying the
+``X-Profile`` header is profiled and three artefacts are written to
+``PROFILING_DIR`` (default ``instance/profiles``), sharing one basename
+that is echoed back in the ``X-Profile-Id`` response header:
+
+* ``X-Profile: cprofile`` (or ``1``) — ``<id>.prof``, a pstats dump usable
+  with snakeviz, flameprof or gprof2dot;
+* ``X-Profile: sample`` — ``<id>.folded``, collapsed stacks of the request
+  thread from a wall-clock sampler, loadable by flamegraph.pl or speedscope;
+* always — ``<id>.sql.txt``, every statement the request issued with its
+  duration, parameters and query plan.
+
+Since Python 3.12 ``cProfile`` hooks the whole process: a ``.prof`` also
+contains whatever other threads ran meanwhile, and only one can be active
+at a time. A ``cprofile`` request arriving while another is being profiled
+(or while some other profiler is active) is sampled instead.
+
+Requests without the header pay only a dictionary lookup.
+"""
+
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# Held while a request is profiled with cProfile (process-wide on 3.12+)
+_cprofile_lock = threading.Lock()
+
+
+class StackSampler:
+    """Samples one thread's call stack on a background thread.
+
+    Produces collapsed ("folded") stacks — one ``frame;frame;frame count``
+    line per unique stack — the input format for flame graph tools.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def write_folded(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RequestProfiler:
+    """Flask extension that profiles requests on demand.
+
+    Create one instance in ``extensions.py`` and call :meth:`init_app`
+    from the app factory.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.output_dir = ""
+        self.sample_interval = 0.001
+
+    def init_app(self, app: Flask) -> None:
+        """Register request hooks and SQL capture when profiling is enabled.
+
+        Args:
+            app: The Flask application. Reads ``PROFILING_ENABLED`` (default
+                False), ``PROFILING_DIR`` and ``PROFILING_SAMPLE_INTERVAL``.
+        """
+        self.enabled = app.config.setdefault("PROFILING_ENABLED", False)
+        if not self.enabled:
+            return
+
+        self.output_dir = app.config.setdefault(
+            "PROFILING_DIR", os.path.join(app.instance_path, "profiles")
+        )
+        self.sample_interval = app.config.setdefault("PROFILING_SAMPLE_INTERVAL", 0.001)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+
+        from extensions import db
+
+        with app.app_context():
+            event.listen(db.engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(db.engine, "after_cursor_execute", self._after_cursor_execute)
+
+    # -- Flask hooks ---------------------------------------------------------
+
+    def _start(self) -> None:
+        mode = request.headers.get(PROFILE_HEADER, "").strip().lower()
+        if not mode or mode in ("0", "false", "off"):
+            return
+
+        g._profile_statements = []
+        if mode != "sample" and _cprofile_lock.acquire(blocking=False):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # A profiler outside this extension is active
+                _cprofile_lock.release()
+            else:
+                g._profile_cprofile = profile
+                return
+
+        sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        sampler.start()
+        g._profile_sampler = sampler
+
+    def _finish(self, response: Response) -> Response:
+        statements = g.pop("_profile_statements", None)
+        if statements is None:
+            return response
+
+        profile, sampler = self._stop_profilers()
+
+        endpoint = re.sub(r"[^\w.-]", "_", request.endpoint or "unmatched")
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        profile_id = f"{stamp}-{endpoint}"
+        base = os.path.join(self.output_dir, profile_id)
+
+        if profile is not None:
+            profile.dump_stats(f"{base}.prof")
+        if sampler is not None:
+            sampler.write_folded(f"{base}.folded")
+        self._write_sql_report(f"{base}.sql.txt", statements)
+
+        response.headers[PROFILE_ID_HEADER] = profile_id
+        return response
+
+    def _teardown(self, error: BaseException | None) -> None:
+        # after_request is skipped when a request fails without a response
+        self._stop_profilers()
+
+    def _stop_profilers(self) -> tuple[cProfile.Profile | None, StackSampler | None]:
+        profile = g.pop("_profile_cprofile", None)
+        sampler = g.pop("_profile_sampler", None)
+        if profile is not None:
+            profile.disable()
+            _cprofile_lock.release()
+        if sampler is not None:
+            sampler.stop()
+        return profile, sampler
+
+    # -- SQL capture ---------------------------------------------------------
+
+    # Start times live on the per-statement execution context (as in
+    # metrics.py), so a statement that raises leaves nothing on the connection
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None and has_request_context() and "_profile_statements" in g:
+            context._profile_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if not (has_request_context() and "_profile_statements" in g):
+            return
+        start = getattr(context, "_profile_start", None)
+        elapsed = time.perf_counter() - start if start is not None else 0.0
+        # executemany passes a sequence of parameter sets; plan the first one
+        params = parameters[0] if executemany and parameters else parameters
+        g._profile_statements.append((statement, params, elapsed, executemany))
+
+    def _write_sql_report(self, path: str, statements: list) -> None:
+        from extensions import db
+
+        total = sum(s[2] for s in statements)
+        lines = [f"{len(statements)} statements, {total * 1000:.3f} ms total", ""]
+        with db.engine.connect() as conn:
+            explain = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+            for i, (statement, params, elapsed, executemany) in enumerate(statements, 1):
+                suffix = " (executemany)" if executemany else ""
+                lines.append(f"-- [{i}] {elapsed * 1000:.3f} ms{suffix}")
+                lines.append(statement.strip())
+                lines.append(f"-- params: {params!r}")
+                try:
+                    plan = conn.exec_driver_sql(explain + statement, params or ()).fetchall()
+                    lines.extend(f"--   {' | '.join(str(col) for col in row)}" for row in plan)
+                except Exception as e:  # noqa: BLE001 — a bad plan must not fail the request
+                    lines.append(f"--   plan unavailable: {e}")
+                lines.append("")
+        with open(path, "w") as f:
+            f.write("\n".join(lines))
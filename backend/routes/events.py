@@ -0,0 +1,119 @@
+"""Server-Sent Events stream of library and progress changes."""
+
+import json
+from collections.abc import Iterator
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from auth import current_user_id
+from services.changelog import change_to_dict, changes_since, latest_seq, truncated_through
+from services.events import EVENT_TYPES, Event, Subscription, broker
+
+events_bp = Blueprint("events", __name__)
+
+# Most change-log entries replayed to a reconnecting client before it is
+# told to re-fetch instead
+MAX_REPLAY = 1000
+
+
+def _format_event(event: Event) -> str:
+    """Encode an event in the ``text/event-stream`` wire format."""
+    lines = []
+    if event.id is not None:
+        lines.append(f"id: {event.id}")
+    lines.append(f"event: {event.type}")
+    lines.append(f"data: {json.dumps(event.data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _replay(since: int, user_id: int | None) -> list[Event]:
+    """Return change-log events after ``since``, or a single ``reset`` event.
+
+    A reset tells the client its position is no longer covered by the log
+    (truncated, or too far behind) and it should re-fetch via REST.
+    """
+    if since < truncated_through():
+        return [Event("reset", {"latest_seq": latest_seq()}, id=latest_seq())]
+    changes = changes_since(since, MAX_REPLAY + 1, user_id)
+    if len(changes) > MAX_REPLAY:
+        return [Event("reset", {"latest_seq": latest_seq()}, id=latest_seq())]
+    return [
+        Event(EVENT_TYPES[(c.entity, c.op)], change_to_dict(c), id=c.seq) for c in changes
+    ]
+
+
+def _stream(
+    subscription: Subscription,
+    replayed: list[Event],
+    last_seq: int,
+    heartbeat: float,
+    retry_ms: int,
+) -> Iterator[str]:
+    """Yield replayed events, then live ones, with comment heartbeats when idle."""
+    yield f"retry: {retry_ms}\n\n"
+    for event in replayed:
+        last_seq = max(last_seq, event.id)
+        yield _format_event(event)
+    while not subscription.overflowed:
+        event = subscription.get(timeout=heartbeat)
+        if event is None:
+            yield ": heartbeat\n\n"
+        elif event.id is None or event.id > last_seq:
+            # Skip events already sent during replay
+            last_seq = max(last_seq, event.id or 0)
+            yield _format_event(event)
+    # Too slow to keep up: end the stream so the client reconnects
+    # with Last-Event-ID and catches up from the change log
+
+
+@events_bp.route("/events", methods=["GET"])
+def events() -> tuple[Response, int] | Response:
+    """Stream ``video-created``, ``video-deleted`` and ``progress-created`` events.
+
+    ``import-progress`` events (no ``id``) carry playlist/channel import
+    job status. Each change event's ``id`` is its change-log ``seq`` and its data is the
+    same object ``GET /api/sync`` returns. Reconnecting clients send
+    ``Last-Event-ID`` (browsers do this automatically) or ``?since=<seq>``
+    and receive the changes they missed first; if those are no longer in
+    the log a ``reset`` event tells them to re-fetch. Authenticated clients
+    only receive their own changes and imports. A comment line is sent
+    every ``EVENTS_HEARTBEAT_SECONDS`` to keep idle connections open.
+
+    Returns:
+        A ``text/event-stream`` response; 400 if the resume position is
+        not a non-negative integer.
+    """
+    resume = request.headers.get("Last-Event-ID") or request.args.get("since")
+    try:
+        since = int(resume) if resume is not None else None
+    except ValueError:
+        since = -1
+    if since is not None and since < 0:
+        return jsonify({"error": "'Last-Event-ID' must be a non-negative integer"}), 400
+
+    # Subscribe before reading the log so nothing committed in between is
+    # missed; duplicates are filtered by seq in _stream
+    user_id = current_user_id()
+    subscription = broker.subscribe(user_id)
+    try:
+        replayed = _replay(since, user_id) if since is not None else []
+    except Exception:
+        broker.unsubscribe(subscription)
+        raise
+
+    stream = _stream(
+        subscription,
+        replayed,
+        since or 0,
+        current_app.config["EVENTS_HEARTBEAT_SECONDS"],
+        current_app.config["EVENTS_RETRY_MS"],
+    )
+    response = Response(
+        stream,
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Not in a finally inside _stream: a generator that never started (HEAD,
+    # or a client gone before the first chunk) doesn't run it when closed
+    response.call_on_close(lambda: broker.unsubscribe(subscription))
+    return response
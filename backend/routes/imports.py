@@ -0,0 +1,49 @@
+"""REST endpoints for importing whole playlists and channels."""
+
+from flask import Blueprint, Response, jsonify, request
+
+from auth import current_user_id
+from services.importer import ImportBusyError, get_job, start_import
+from services.youtube_service import extract_collection_url
+
+import_bp = Blueprint("import", __name__)
+
+
+@import_bp.route("/import", methods=["POST"])
+def create_import() -> tuple[Response, int]:
+    """Start importing every video of a playlist or channel in the background.
+
+    Request body:
+        ``{"url": "<YouTube playlist or channel URL>"}``
+
+    Returns:
+        202 with the job (poll ``GET /api/import/<job_id>`` or listen for
+        ``import-progress`` on ``GET /api/events``); 200 with the existing
+        job if the same URL is already importing. 400 if the URL is missing
+        or not a playlist/channel, 429 if too many imports are running.
+    """
+    data = request.get_json(silent=True)
+    if not data or "url" not in data:
+        return jsonify({"error": "Missing 'url' field"}), 400
+
+    url = extract_collection_url(data["url"])
+    if not url:
+        return jsonify({"error": "Not a YouTube playlist or channel URL"}), 400
+
+    try:
+        job, created = start_import(url)
+    except ImportBusyError:
+        return jsonify({
+            "error": "Too many imports running, try again later",
+            "error_code": "IMPORT_BUSY",
+        }), 429
+    return jsonify(job.to_dict()), 202 if created else 200
+
+
+@import_bp.route("/import/<job_id>", methods=["GET"])
+def get_import(job_id: str) -> tuple[Response, int] | Response:
+    """Return the status and counters of one of the requester's import jobs."""
+    job = get_job(job_id)
+    if job is None or job.user_id != current_user_id():
+        return jsonify({"error": "Import job not found"}), 404
+    return jsonify(job.to_dict())
@@ -2,8 +2,11 @@
 
 from flask import Blueprint, Response, jsonify, request
 
+from auth import current_user_id, user_filter
 from extensions import db
 from models import Progress, Video
+from services.changelog import record_change
+from services.library import add_to_library
 
 progress_bp = Blueprint("progress", __name__)
 
@@ -27,6 +30,9 @@ def create_progress() -> tuple[Response, int]:
     Request body:
         ``{"video_id": "...", "round": 1, "step": 3, "notes": "optional"}``
 
+    Entries logged by an authenticated user belong to that user, and the
+    video is added to their library if it isn't there yet.
+
     Returns:
         201 with the created entry. 400 for validation errors. 404 if
         the video doesn't exist in the database.
@@ -58,21 +64,31 @@ def create_progress() -> tuple[Response, int]:
     if not video:
         return jsonify({"error": "Video not found"}), 404
 
+    user_id = current_user_id()
+    if user_id is not None:
+        add_to_library(user_id, [video])
+
     entry = Progress(
         video_id=video_id,
+        user_id=user_id,
         round=round_num,
         step=step,
         notes=data.get("notes"),
     )
     db.session.add(entry)
+    db.session.flush()
+    # Reload so the logged payload matches what GET /progress later returns
+    db.session.refresh(entry)
+    payload = _progress_to_dict(entry)
+    record_change("progress", "insert", entry.id, video_id, payload, user_id)
     db.session.commit()
 
-    return jsonify(_progress_to_dict(entry)), 201
+    return jsonify(payload), 201
 
 
 @progress_bp.route("/progress/<video_id>", methods=["GET"])
 def get_progress(video_id: str) -> tuple[Response, int] | Response:
-    """Return progress history for a video.
+    """Return the requesting user's progress history for a video.
 
     Args:
         video_id: The YouTube video ID (URL path parameter).
@@ -86,7 +102,9 @@ def get_progress(video_id: str) -> tuple[Response, int] | Response:
         return jsonify({"error": "Video not found"}), 404
 
     entries = (
-        Progress.query.filter_by(video_id=video_id)
+        Progress.query.filter(
+            user_filter(Progress.user_id, current_user_id()), Progress.video_id == video_id
+        )
         .order_by(Progress.created_at)
         .all()
     )
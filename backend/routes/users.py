@@ -0,0 +1,56 @@
+"""REST endpoints for creating users and inspecting the current one."""
+
+from flask import Blueprint, Response, jsonify, request
+
+from auth import current_user_id, generate_token, hash_token
+from extensions import db
+from models import User
+
+users_bp = Blueprint("users", __name__)
+
+MAX_NAME_LENGTH = 100
+
+
+def _user_to_dict(user: User) -> dict:
+    """Serialize a User model instance to an API-friendly dict (no token)."""
+    return {
+        "id": user.id,
+        "name": user.name,
+        "created_at": user.created_at.isoformat(),
+    }
+
+
+@users_bp.route("/users", methods=["POST"])
+def create_user() -> tuple[Response, int]:
+    """Create a user and issue their bearer token.
+
+    Request body:
+        ``{"name": "..."}``
+
+    Returns:
+        201 with the user and ``token``. The token is only returned here;
+        send it as ``Authorization: Bearer <token>``. 400 if ``name`` is
+        missing or too long.
+    """
+    data = request.get_json(silent=True)
+    name = data.get("name") if isinstance(data, dict) else None
+    if not isinstance(name, str) or not name.strip():
+        return jsonify({"error": "Missing 'name' field"}), 400
+    if len(name) > MAX_NAME_LENGTH:
+        return jsonify({"error": f"'name' must be at most {MAX_NAME_LENGTH} characters"}), 400
+
+    token = generate_token()
+    user = User(name=name.strip(), token_hash=hash_token(token))
+    db.session.add(user)
+    db.session.commit()
+
+    return jsonify({**_user_to_dict(user), "token": token}), 201
+
+
+@users_bp.route("/users/me", methods=["GET"])
+def get_current_user() -> tuple[Response, int] | Response:
+    """Return the authenticated user; 401 without a bearer token."""
+    user_id = current_user_id()
+    if user_id is None:
+        return jsonify({"error": "Authentication required", "error_code": "AUTH_REQUIRED"}), 401
+    return jsonify(_user_to_dict(db.session.get(User, user_id)))
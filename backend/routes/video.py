@@ -1,19 +1,140 @@
 """REST endpoints for fetching and retrieving YouTube video data."""
 
+import re
+
 from flask import Blueprint, Response, jsonify, request
-from yt_dlp.utils import DownloadError
-from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled
+from sqlalchemy import delete, exists, select
+from sqlalchemy.exc import IntegrityError
 
-from extensions import db
-from models import Progress, Video
+from auth import current_user_id
+from extensions import db, metrics
+from models import Progress, Transcript, TranscriptSegmentation, UserVideo, Video
+from services.changelog import record_video_deletes
+from services.library import add_to_library, add_video, library_entries, remove_from_library
+from services.resilience import RateLimitedError, UpstreamThrottledError
+from services.transcript_processing import process_transcript
 from services.youtube_service import (
+    DEFAULT_LANGUAGE,
+    classify_fetch_error,
     extract_video_id,
     fetch_transcript,
     fetch_video_metadata,
+    list_transcript_languages,
 )
 
 video_bp = Blueprint("video", __name__)
 
+# Upper bound on IDs accepted by one bulk delete (keeps the IN list bounded)
+MAX_BULK_DELETE = 500
+
+# BCP-47-ish language codes as used by YouTube captions (en, pt-BR, zh-Hant)
+LANGUAGE_CODE_PATTERN = re.compile(r"[A-Za-z]{2,3}(?:-[A-Za-z0-9]{2,8})*")
+
+
+def _delete_videos(video_ids: list[str]) -> tuple[list[str], list[str]]:
+    """Delete videos that are in no user's library, with their progress.
+
+    Used for unauthenticated deletes, which only act on the global view:
+    a video some user has in their library is left untouched, together
+    with its global progress. The video delete re-checks membership in SQL
+    so one added concurrently is never deleted from under its user.
+    Progress rows are deleted explicitly rather than via ORM cascade so
+    nothing is loaded into Python; this also covers databases created
+    before the FK gained ``ON DELETE CASCADE``. Per-language transcripts
+    and segmentations were created with the cascade and are removed by the
+    database. A global ``delete`` change is logged for each deleted ID.
+    Does not commit.
+
+    Returns:
+        ``(existing, deleted)``: IDs of the stored videos among
+        ``video_ids``, and of those that were deleted.
+    """
+    in_use = exists().where(UserVideo.video_id == Video.video_id)
+    rows = db.session.execute(
+        select(Video.video_id, in_use.label("in_use")).where(Video.video_id.in_(video_ids))
+    ).all()
+    existing = [row.video_id for row in rows]
+    # A literal IN list: SQLite deletes far slower through an IN (subquery)
+    deletable = [row.video_id for row in rows if not row.in_use]
+    if not deletable:
+        return existing, []
+    db.session.execute(delete(Progress).where(
+        Progress.user_id.is_(None), Progress.video_id.in_(deletable)
+    ))
+    deleted = list(db.session.scalars(
+        delete(Video).where(Video.video_id.in_(deletable), ~in_use).returning(Video.video_id)
+    ))
+    if deleted:
+        record_video_deletes([(None, video_id) for video_id in deleted])
+    return existing, deleted
+
+
+def _in_use_response() -> tuple[Response, int]:
+    return jsonify({
+        "error": "Video is in a user's library and can only be removed by its users",
+        "error_code": "VIDEO_IN_USE",
+    }), 409
+
+
+def _fetch_error_response(error: Exception) -> tuple[Response, int]:
+    """Map an exception from the YouTube fetch helpers to a JSON error.
+
+    Re-raises errors that aren't known upstream failures so the global
+    handler turns them into a 500.
+    """
+    if isinstance(error, UpstreamThrottledError):
+        resp = jsonify({
+            "error": "YouTube is temporarily unavailable, please retry shortly",
+            "error_code": error.error_code,
+        })
+        resp.headers["Retry-After"] = str(max(1, round(error.retry_after)))
+        return resp, 429 if isinstance(error, RateLimitedError) else 503
+
+    error_code = classify_fetch_error(error)
+    if error_code == "TRANSCRIPT_UNAVAILABLE":
+        return jsonify({
+            "error": "Transcript is unavailable for this video",
+            "error_code": error_code,
+        }), 422
+    if error_code == "VIDEO_UNAVAILABLE":
+        return jsonify({
+            "error": f"Failed to fetch video data: {error}",
+            "error_code": error_code,
+        }), 502
+    raise error
+
+
+def _store_once(row: Transcript | TranscriptSegmentation) -> Transcript | TranscriptSegmentation:
+    """Insert and commit a per-language row computed on first request.
+
+    Concurrent first requests all compute the row; whichever commits
+    second hits the primary key and gets the stored row instead of a 500.
+    """
+    db.session.add(row)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        # None only if the video was deleted meanwhile; serve what we computed
+        return db.session.get(type(row), (row.video_id, row.language)) or row
+    return row
+
+
+def _segmentation_for(
+    video_id: str, language: str, segments: list[dict]
+) -> TranscriptSegmentation:
+    """Return stored sentences/chunks for a transcript, computing them once if missing."""
+    segmentation = db.session.get(TranscriptSegmentation, (video_id, language))
+    if segmentation is None:
+        processed = process_transcript(segments)
+        segmentation = _store_once(TranscriptSegmentation(
+            video_id=video_id,
+            language=language,
+            sentences_json=processed["sentences"],
+            chunks_json=processed["chunks"],
+        ))
+    return segmentation
+
 
 def _video_to_dict(video: Video) -> dict:
     """Serialize a Video model instance to an API-friendly dict."""
@@ -35,7 +156,9 @@ def create_video() -> tuple[Response, int] | Response:
 
     Returns:
         JSON with video_id, title, duration, thumbnail, and transcript.
-        400 if the URL is missing or invalid, 502 if the upstream fetch fails.
+        400 if the URL is missing or invalid, 502 if the upstream fetch fails,
+        429/503 (with ``Retry-After``) while upstream calls are rate limited
+        or the circuit breaker is open.
     """
     data = request.get_json(silent=True)
     if not data or "url" not in data:
@@ -45,34 +168,23 @@ def create_video() -> tuple[Response, int] | Response:
     if not video_id:
         return jsonify({"error": "Invalid YouTube URL"}), 400
 
+    user_id = current_user_id()
+
     # Return cached data if we already have this video
     existing = db.session.get(Video, video_id)
+    metrics.record_cache("video_db", hit=existing is not None)
     if existing:
+        if user_id is not None and add_to_library(user_id, [existing]):
+            db.session.commit()
         return jsonify(_video_to_dict(existing))
 
     try:
         metadata = fetch_video_metadata(video_id)
         transcript = fetch_transcript(video_id)
-    except (NoTranscriptFound, TranscriptsDisabled):
-        return jsonify({
-            "error": "Transcript is unavailable for this video",
-            "error_code": "TRANSCRIPT_UNAVAILABLE",
-        }), 422
-    except DownloadError as e:
-        return jsonify({
-            "error": f"Failed to fetch video data: {e}",
-            "error_code": "VIDEO_UNAVAILABLE",
-        }), 502
+    except Exception as e:
+        return _fetch_error_response(e)
 
-    # Persist to database
-    video = Video(
-        video_id=video_id,
-        title=metadata["title"],
-        duration=metadata["duration"],
-        thumbnail=metadata["thumbnail"],
-        transcript_json=transcript,
-    )
-    db.session.add(video)
+    video = add_video(video_id, metadata, transcript, user_id)
     db.session.commit()
 
     return jsonify(_video_to_dict(video))
@@ -82,44 +194,97 @@ def create_video() -> tuple[Response, int] | Response:
 def get_transcript(video_id: str) -> tuple[Response, int] | Response:
     """Return cached transcript for a previously fetched video.
 
+    Query params:
+        ``lang``: Optional language code (default ``en``). Other languages
+        are fetched or translated from YouTube on first request and stored,
+        so later requests never touch the network.
+        ``granularity``: ``segment`` (default, raw caption fragments) or
+        ``sentence`` (merged sentences plus practice ``chunks``).
+
     Args:
         video_id: The 11-character YouTube video ID (URL path parameter).
 
     Returns:
-        JSON with video_id and transcript array. 404 if the video hasn't
-        been fetched yet.
+        JSON with video_id, language and transcript array (plus chunks for
+        sentence granularity). 404 if the video hasn't been fetched yet, 400
+        for a malformed ``lang`` or ``granularity``, and the same upstream
+        errors as ``POST /api/video`` for a new language.
+    """
+    language = request.args.get("lang", DEFAULT_LANGUAGE)
+    if not LANGUAGE_CODE_PATTERN.fullmatch(language):
+        return jsonify({"error": "Invalid 'lang' parameter"}), 400
+    granularity = request.args.get("granularity", "segment")
+    if granularity not in ("segment", "sentence"):
+        return jsonify({"error": "'granularity' must be 'segment' or 'sentence'"}), 400
+
+    video = db.session.get(Video, video_id)
+    if not video:
+        return jsonify({"error": "Video not found"}), 404
+
+    if language == DEFAULT_LANGUAGE:
+        segments = video.transcript_json
+    else:
+        stored = db.session.get(Transcript, (video_id, language))
+        metrics.record_cache("transcript_db", hit=stored is not None)
+        if stored is None:
+            try:
+                fetched = fetch_transcript(video_id, language)
+            except Exception as e:
+                return _fetch_error_response(e)
+            stored = _store_once(
+                Transcript(video_id=video_id, language=language, segments_json=fetched)
+            )
+        segments = stored.segments_json
+
+    if granularity == "sentence":
+        segmentation = _segmentation_for(video_id, language, segments)
+        return jsonify({
+            "video_id": video.video_id,
+            "language": language,
+            "granularity": granularity,
+            "transcript": segmentation.sentences_json,
+            "chunks": segmentation.chunks_json,
+        })
+
+    return jsonify({"video_id": video.video_id, "language": language, "transcript": segments})
+
+
+@video_bp.route("/video/<video_id>/transcript/languages", methods=["GET"])
+def get_transcript_languages(video_id: str) -> tuple[Response, int] | Response:
+    """List native and translatable transcript languages for a cached video.
+
+    Returns:
+        JSON with video_id, ``tracks``, ``translation_languages`` and
+        ``stored`` (languages already available without a fetch). 404 if
+        the video hasn't been fetched yet.
     """
     video = db.session.get(Video, video_id)
     if not video:
         return jsonify({"error": "Video not found"}), 404
 
-    return jsonify({"video_id": video.video_id, "transcript": video.transcript_json})
+    try:
+        languages = list_transcript_languages(video_id)
+    except Exception as e:
+        return _fetch_error_response(e)
+
+    stored = db.session.scalars(
+        select(Transcript.language).where(Transcript.video_id == video_id)
+    ).all()
+    return jsonify({
+        "video_id": video_id,
+        **languages,
+        "stored": sorted({DEFAULT_LANGUAGE, *stored}),
+    })
 
 
 @video_bp.route("/videos", methods=["GET"])
 def list_videos() -> Response:
-    """Return all cached videos without transcript, sorted by last practiced."""
-    videos = Video.query.all()
-
-    result = []
-    for v in videos:
-        latest = (
-            Progress.query.filter_by(video_id=v.video_id)
-            .order_by(Progress.created_at.desc())
-            .first()
-        )
-        result.append({
-            "video_id": v.video_id,
-            "title": v.title,
-            "duration": v.duration,
-            "thumbnail": v.thumbnail,
-            "last_practiced": latest.created_at.isoformat() if latest else None,
-            "current_round": latest.round if latest else 0,
-        })
+    """Return the library without transcripts, sorted by last practiced.
 
-    # Sort by last_practiced descending (None values last)
-    result.sort(key=lambda x: x["last_practiced"] or "", reverse=True)
-    return jsonify(result)
+    Authenticated users get their own library and progress; anonymous
+    requests get every stored video with unauthenticated progress.
+    """
+    return jsonify(library_entries(current_user_id()))
 
 
 @video_bp.route("/video/<video_id>", methods=["GET"])
@@ -134,11 +299,64 @@ def get_video(video_id: str) -> tuple[Response, int] | Response:
 
 @video_bp.route("/video/<video_id>", methods=["DELETE"])
 def delete_video(video_id: str) -> tuple[Response, int] | Response:
-    """Delete a video and all its progress entries (cascade)."""
-    video = db.session.get(Video, video_id)
-    if not video:
+    """Delete a video and all its progress entries (cascade).
+
+    For an authenticated user this only removes the video (and their
+    progress on it) from their library; the shared video is kept.
+    Unauthenticated requests can't delete a video that is in any user's
+    library (409 ``VIDEO_IN_USE``).
+    """
+    user_id = current_user_id()
+    if user_id is not None:
+        existing = deleted = remove_from_library(user_id, [video_id])
+    else:
+        existing, deleted = _delete_videos([video_id])
+    if not deleted:
+        db.session.rollback()
+        if existing:
+            return _in_use_response()
         return jsonify({"error": "Video not found"}), 404
 
-    db.session.delete(video)
     db.session.commit()
     return jsonify({"message": "Video deleted"})
+
+
+@video_bp.route("/videos", methods=["DELETE"])
+def delete_videos() -> tuple[Response, int] | Response:
+    """Delete many videos and their progress in a single transaction.
+
+    Request body:
+        ``{"video_ids": ["...", "..."]}`` (at most ``MAX_BULK_DELETE``)
+
+    Authenticated users remove the videos from their own library only.
+    Unauthenticated requests skip videos that are in any user's library.
+
+    Returns:
+        JSON with ``deleted`` (count), ``not_found`` (IDs that weren't
+        in the library) and ``in_use`` (IDs kept because users have them;
+        always empty for authenticated requests). 400 if ``video_ids`` is
+        missing or invalid.
+    """
+    data = request.get_json(silent=True)
+    video_ids = data.get("video_ids") if isinstance(data, dict) else None
+    if not isinstance(video_ids, list) or not video_ids:
+        return jsonify({"error": "'video_ids' must be a non-empty list"}), 400
+    if not all(isinstance(v, str) for v in video_ids):
+        return jsonify({"error": "'video_ids' must contain strings"}), 400
+    if len(video_ids) > MAX_BULK_DELETE:
+        return jsonify({"error": f"At most {MAX_BULK_DELETE} videos per request"}), 400
+
+    video_ids = list(dict.fromkeys(video_ids))
+    user_id = current_user_id()
+    if user_id is not None:
+        existing = deleted = remove_from_library(user_id, video_ids)
+    else:
+        existing, deleted = _delete_videos(video_ids)
+    db.session.commit()
+
+    existing, deleted = set(existing), set(deleted)
+    return jsonify({
+        "deleted": len(deleted),
+        "not_found": [v for v in video_ids if v not in existing],
+        "in_use": [v for v in video_ids if v in existing and v not in deleted],
+    })
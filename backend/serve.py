@@ -0,0 +1,27 @@
+"""Serve the backend with gevent for many concurrent ``/api/events`` streams.
+
+The Flask development server (``python app.py``) spends one thread per
+open connection, which idle SSE clients hold indefinitely. Under gevent
+each connection is a greenlet, and the monkey-patched ``queue.Queue`` that
+subscribers block on yields instead of parking a thread.
+
+Usage::
+
+    uv sync --extra gevent
+    uv run python serve.py            # SHADOWING_HOST / SHADOWING_PORT override
+"""
+
+from gevent import monkey
+
+monkey.patch_all()
+
+import os  # noqa: E402
+
+from gevent.pywsgi import WSGIServer  # noqa: E402
+
+from app import create_app  # noqa: E402
+
+if __name__ == "__main__":
+    host = os.environ.get("SHADOWING_HOST", "127.0.0.1")
+    port = int(os.environ.get("SHADOWING_PORT", "5001"))
+    WSGIServer((host, port), create_app()).serve_forever()
@@ -0,0 +1,286 @@
+"""Change-log helpers backing delta sync (``GET /api/sync``).
+
+Routes call :func:`record_change` in the same transaction as the write it
+describes, so a change is visible to sync exactly when it is committed;
+at that point it is also published to ``GET /api/events`` subscribers.
+Every ``COMPACT_EVERY`` entries the log is compacted in a background
+thread once the triggering transaction commits, so no request waits on it:
+
+* inserts of entities that were later deleted are dropped (clients that
+  saw the insert still receive the delete; clients that didn't need
+  neither), as are progress inserts for videos that were later deleted,
+  each within the same user's view;
+* entries older than ``RETENTION`` are truncated, and the truncation point
+  is recorded so clients that fell further behind are told to re-fetch.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask, current_app
+from sqlalchemy import Select, and_, delete, event, func, insert, select, true
+from sqlalchemy.orm import Session, aliased
+
+from auth import user_filter
+from extensions import db
+from models import ChangeLog, SyncCheckpoint
+from services.events import EVENT_TYPES, Event, publish_after_commit
+
+COMPACT_EVERY = 1000
+RETENTION = timedelta(days=30)
+
+# Session.info key marking a transaction that should trigger compaction
+_COMPACT_KEY = "changelog_compact_app"
+# Held while a background compaction runs, so at most one runs at a time
+_compaction_lock = threading.Lock()
+
+
+def record_change(
+    entity: str,
+    op: str,
+    entity_id: str,
+    video_id: str,
+    payload: dict | None = None,
+    user_id: int | None = None,
+) -> ChangeLog:
+    """Append a change to the log (does not commit).
+
+    Args:
+        entity: ``"video"`` or ``"progress"``.
+        op: ``"insert"`` or ``"delete"``.
+        entity_id: Primary key of the changed row, as a string.
+        video_id: Video the change belongs to (used for compaction).
+        payload: Row data for inserts, as returned by the REST endpoints.
+        user_id: User whose view changed; None for the global view.
+    """
+    change = ChangeLog(
+        entity=entity,
+        op=op,
+        entity_id=str(entity_id),
+        video_id=video_id,
+        payload=payload,
+        user_id=user_id,
+    )
+    db.session.add(change)
+    db.session.flush()
+    _publish(change_to_dict(change), user_id)
+    _maybe_compact(change.seq, change.seq)
+    return change
+
+
+def record_video_deletes(deletes: list[tuple[int | None, str]]) -> None:
+    """Append ``video``/``delete`` changes in one statement (does not commit).
+
+    Args:
+        deletes: ``(user_id, video_id)`` pairs; ``user_id`` None records
+            the delete in the global view.
+    """
+    now = datetime.now(timezone.utc)
+    rows = db.session.execute(
+        insert(ChangeLog).returning(ChangeLog.seq, ChangeLog.user_id, ChangeLog.entity_id),
+        [
+            {"entity": "video", "op": "delete", "entity_id": video_id,
+             "video_id": video_id, "user_id": user_id, "created_at": now}
+            for user_id, video_id in deletes
+        ],
+    ).all()
+    for seq, user_id, video_id in sorted(rows, key=lambda r: r.seq):
+        _publish({
+            "seq": seq, "entity": "video", "op": "delete",
+            "id": video_id, "video_id": video_id, "data": None,
+        }, user_id)
+    _maybe_compact(min(r.seq for r in rows), max(r.seq for r in rows))
+
+
+def change_to_dict(change: ChangeLog) -> dict:
+    """Serialize a change as returned by ``GET /api/sync`` and ``GET /api/events``."""
+    return {
+        "seq": change.seq,
+        "entity": change.entity,
+        "op": change.op,
+        "id": change.entity_id,
+        "video_id": change.video_id,
+        "data": change.payload,
+    }
+
+
+def _publish(change: dict, user_id: int | None) -> None:
+    """Publish ``change`` to ``user_id``'s subscribers once the transaction commits."""
+    event_type = EVENT_TYPES[(change["entity"], change["op"])]
+    publish_after_commit(
+        db.session(), Event(event_type, change, id=change["seq"], user_id=user_id)
+    )
+
+
+def _maybe_compact(first_seq: int, last_seq: int) -> None:
+    """Schedule compaction when ``[first_seq, last_seq]`` reaches a multiple of ``COMPACT_EVERY``."""
+    if first_seq % COMPACT_EVERY == 0 or first_seq // COMPACT_EVERY != last_seq // COMPACT_EVERY:
+        db.session().info[_COMPACT_KEY] = current_app._get_current_object()
+
+
+@event.listens_for(Session, "after_commit")
+def _start_scheduled_compaction(session: Session) -> None:
+    app = session.info.pop(_COMPACT_KEY, None)
+    if app is not None:
+        start_compaction(app)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_scheduled_compaction(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_COMPACT_KEY, None)
+
+
+def start_compaction(app: Flask) -> threading.Thread | None:
+    """Run :func:`compact_changelog` in a background thread and commit.
+
+    Returns:
+        The started thread, or None if a compaction is already running
+        (the next ``COMPACT_EVERY`` boundary catches up).
+    """
+    if not _compaction_lock.acquire(blocking=False):
+        return None
+    thread = threading.Thread(
+        target=_compact_in_app_context, args=(app,), name="changelog-compact", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _compact_in_app_context(app: Flask) -> None:
+    try:
+        with app.app_context():
+            try:
+                compact_changelog()
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                app.logger.exception("Change-log compaction failed")
+            finally:
+                db.session.remove()
+    finally:
+        _compaction_lock.release()
+
+
+def latest_seq() -> int:
+    """Return the highest sequence number ever issued (0 if none)."""
+    current = db.session.scalar(select(func.max(ChangeLog.seq)))
+    return max(current or 0, truncated_through())
+
+
+def truncated_through() -> int:
+    """Return the highest ``seq`` removed by time-based truncation."""
+    checkpoint = db.session.get(SyncCheckpoint, 1)
+    return checkpoint.truncated_through if checkpoint else 0
+
+
+def changes_since(since: int, limit: int, user_id: int | None = None) -> list[ChangeLog]:
+    """Return up to ``limit`` of a user's changes with ``seq > since``, oldest first."""
+    return db.session.scalars(
+        select(ChangeLog)
+        .where(user_filter(ChangeLog.user_id, user_id), ChangeLog.seq > since)
+        .order_by(ChangeLog.seq)
+        .limit(limit)
+    ).all()
+
+
+def changes_page(
+    since: int, limit: int, user_id: int | None = None
+) -> tuple[list[ChangeLog], int | None]:
+    """Return :func:`changes_since` plus the log's highest ``seq``, in one statement.
+
+    One statement reads one snapshot, so no change of the user's can be
+    committed below the returned head without appearing in the page.
+
+    Returns:
+        ``(changes, head)``; ``head`` is None when the log is empty.
+    """
+    head = select(func.max(ChangeLog.seq).label("seq")).subquery()
+    page = (
+        select(ChangeLog)
+        .where(user_filter(ChangeLog.user_id, user_id), ChangeLog.seq > since)
+        .order_by(ChangeLog.seq)
+        .limit(limit)
+        .subquery()
+    )
+    change = aliased(ChangeLog, page)
+    # Outer join so an empty page still yields the head
+    rows = db.session.execute(
+        select(head.c.seq, change).select_from(head).outerjoin(page, true()).order_by(page.c.seq)
+    ).all()
+    return [c for _, c in rows if c is not None], rows[0][0]
+
+
+def compact_changelog(now: datetime | None = None) -> int:
+    """Drop superseded and expired change-log entries (does not commit).
+
+    Args:
+        now: Reference time for retention (defaults to the current time).
+
+    Returns:
+        Number of entries removed.
+    """
+    now = now or datetime.now(timezone.utc)
+    removed = 0
+
+    # Inserts whose entity was deleted afterwards: join against each
+    # entity's last delete rather than probing the log once per row
+    last_delete = (
+        select(
+            ChangeLog.entity,
+            ChangeLog.entity_id,
+            ChangeLog.user_id,
+            func.max(ChangeLog.seq).label("seq"),
+        )
+        .where(ChangeLog.op == "delete")
+        .group_by(ChangeLog.entity, ChangeLog.entity_id, ChangeLog.user_id)
+        .subquery()
+    )
+    removed += _delete_seqs(
+        select(ChangeLog.seq).join(last_delete, and_(
+            last_delete.c.entity == ChangeLog.entity,
+            last_delete.c.entity_id == ChangeLog.entity_id,
+            last_delete.c.user_id.is_not_distinct_from(ChangeLog.user_id),
+            last_delete.c.seq > ChangeLog.seq,
+        )).where(ChangeLog.op == "insert")
+    )
+
+    # Progress inserts for videos deleted afterwards
+    last_video_delete = (
+        select(ChangeLog.video_id, ChangeLog.user_id, func.max(ChangeLog.seq).label("seq"))
+        .where(ChangeLog.entity == "video", ChangeLog.op == "delete")
+        .group_by(ChangeLog.video_id, ChangeLog.user_id)
+        .subquery()
+    )
+    removed += _delete_seqs(
+        select(ChangeLog.seq).join(last_video_delete, and_(
+            last_video_delete.c.video_id == ChangeLog.video_id,
+            last_video_delete.c.user_id.is_not_distinct_from(ChangeLog.user_id),
+            last_video_delete.c.seq > ChangeLog.seq,
+        )).where(ChangeLog.entity == "progress")
+    )
+
+    # Time-based truncation, remembered so lagging clients get a reset
+    cutoff = db.session.scalar(
+        select(func.max(ChangeLog.seq)).where(ChangeLog.created_at < now - RETENTION)
+    )
+    if cutoff is not None:
+        removed += db.session.execute(
+            delete(ChangeLog).where(ChangeLog.seq <= cutoff),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        checkpoint = db.session.get(SyncCheckpoint, 1)
+        if checkpoint is None:
+            db.session.add(SyncCheckpoint(id=1, truncated_through=cutoff))
+        else:
+            checkpoint.truncated_through = max(checkpoint.truncated_through, cutoff)
+
+    return removed
+
+
+def _delete_seqs(seqs: Select) -> int:
+    """Delete the change-log entries whose ``seq`` is selected by ``seqs``."""
+    return db.session.execute(
+        delete(ChangeLog).where(ChangeLog.seq.in_(seqs)),
+        execution_options={"synchronize_session": False},
+    ).rowcount
@@ -0,0 +1,125 @@
+"""In-process publish/subscribe for the Server-Sent Events stream.
+
+Each ``GET /api/events`` connection subscribes with its own bounded queue,
+and :meth:`EventBroker.publish` fans an event out to every queue without
+blocking. A subscriber that falls ``queue_size`` events behind is cut off
+instead of slowing publishers down. Clients then reconnect with
+``Last-Event-ID`` and the missed changes are replayed from the change log.
+
+Change-log events are published from a session ``after_commit`` hook, so
+subscribers only ever see committed writes. Under gevent (see ``serve.py``)
+``queue.Queue`` is monkey-patched to be cooperative, which means an idle
+connection costs a parked greenlet rather than a thread.
+"""
+
+import queue
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from extensions import metrics
+
+# Change-log (entity, op) pairs and the SSE event type they're published as
+EVENT_TYPES = {
+    ("video", "insert"): "video-created",
+    ("video", "delete"): "video-deleted",
+    ("progress", "insert"): "progress-created",
+}
+
+DEFAULT_QUEUE_SIZE = 256
+
+# Session.info key holding events waiting for the transaction to commit
+_PENDING_KEY = "pending_events"
+
+
+@dataclass(frozen=True)
+class Event:
+    """One SSE message; ``id`` is the change-log ``seq`` when there is one.
+
+    Only subscribers with the same ``user_id`` receive it (None being the
+    unauthenticated global view).
+    """
+
+    type: str
+    data: dict
+    id: int | None = None
+    user_id: int | None = None
+
+
+class Subscription:
+    """A subscriber's queue; ``overflowed`` is set once events were dropped."""
+
+    def __init__(self, queue_size: int, user_id: int | None = None) -> None:
+        self.queue: queue.Queue[Event] = queue.Queue(maxsize=queue_size)
+        self.user_id = user_id
+        self.overflowed = False
+
+    def get(self, timeout: float) -> Event | None:
+        """Return the next event, or None if none arrived within ``timeout``."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBroker:
+    """Fans published events out to all current subscriptions."""
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self._subscriptions: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, user_id: int | None = None) -> Subscription:
+        subscription = Subscription(self.queue_size, user_id)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event_: Event) -> None:
+        """Deliver ``event_`` to its user's subscribers, dropping overflowing ones."""
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.user_id == event_.user_id]
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(event_)
+            except queue.Full:
+                subscription.overflowed = True
+                self.unsubscribe(subscription)
+
+
+broker = EventBroker()
+
+metrics.register_gauge(
+    "shadowing_sse_subscribers",
+    "Open Server-Sent Events connections.",
+    (),
+    lambda: {(): broker.subscriber_count},
+)
+
+
+def publish_after_commit(session: Session, event_: Event) -> None:
+    """Queue ``event_`` to be published once ``session`` commits."""
+    session.info.setdefault(_PENDING_KEY, []).append(event_)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for pending in session.info.pop(_PENDING_KEY, []):
+        broker.publish(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,158 @@
+"""Disk-backed cache for raw upstream (YouTube) fetch results.
+
+Entries live in a small standalone SQLite file, separate from the app
+database, so they survive video deletion and app restarts. Each entry is
+either a positive result (JSON value) or a negative one (an error code and
+message), each with its own expiry. The file is bounded by total payload
+size; the least recently used entries are evicted first.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetch_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    error_code TEXT,
+    error_message TEXT,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached fetch result: either ``value`` or ``error_code`` is set."""
+
+    value: Any = None
+    error_code: str | None = None
+    error_message: str | None = None
+
+
+class FetchCache:
+    """TTL + size-bounded key/value cache stored in a SQLite file.
+
+    The cache is a no-op until :meth:`configure` is called with a path, so
+    importing modules can hold a module-level instance safely.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self.path: str | None = None
+        self.max_bytes = DEFAULT_MAX_BYTES
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def configure(self, path: str | None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Point the cache at a SQLite file, or disable it with ``None``.
+
+        Args:
+            path: Filesystem path of the cache database, or None to disable.
+            max_bytes: Upper bound on the total size of stored payloads.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, commit on success and always close it."""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the unexpired entry for ``key``, or None."""
+        if not self.enabled:
+            return None
+        now = self._clock()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, error_code, error_message FROM fetch_cache "
+                "WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE fetch_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        value, error_code, error_message = row
+        return CacheEntry(
+            value=json.loads(value) if value is not None else None,
+            error_code=error_code,
+            error_message=error_message,
+        )
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a positive result for ``ttl`` seconds."""
+        self._put(key, json.dumps(value), None, None, ttl)
+
+    def set_error(self, key: str, error_code: str, message: str, ttl: float) -> None:
+        """Store a negative result (e.g. ``TRANSCRIPT_UNAVAILABLE``) for ``ttl`` seconds."""
+        self._put(key, None, error_code, message, ttl)
+
+    def delete(self, key: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM fetch_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM fetch_cache")
+
+    def _put(
+        self, key: str, value: str | None, error_code: str | None, message: str | None, ttl: float
+    ) -> None:
+        if not self.enabled:
+            return
+        now = self._clock()
+        size = len(key) + len(value or "") + len(message or "")
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fetch_cache "
+                "(key, value, error_code, error_message, expires_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, value, error_code, message, now + ttl, now, size),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones over ``max_bytes``."""
+        conn.execute("DELETE FROM fetch_cache WHERE expires_at <= ?", (now,))
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM fetch_cache").fetchone()
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM fetch_cache ORDER BY accessed_at"
+        ):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM fetch_cache WHERE key = ?", victims)
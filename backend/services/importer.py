@@ -0,0 +1,289 @@
+"""Background import of whole playlists and channels.
+
+An import job streams through four stages so memory stays bounded by the
+batch size plus the in-flight limit, however large the channel is:
+
+1. :func:`~services.youtube_service.iter_collection_entries` lazily
+   enumerates the playlist/channel via yt-dlp flat extraction;
+2. entries are looked up against ``videos`` in batches of ``batch_size``
+   (one ``IN`` query per batch) and already-stored IDs are skipped (or,
+   for a user's import, just added to their library);
+3. a thread pool fetches metadata and transcripts for the rest, with at
+   most ``max_in_flight`` fetches outstanding; the enumerator is not
+   advanced while the pool is full (backpressure);
+4. the job thread persists each result as it completes, committing per
+   video so library and SSE clients see videos arrive one by one.
+
+Workers never touch the database. Job state lives in memory and is
+published to ``GET /api/events`` as ``import-progress`` events.
+"""
+
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+
+from flask import Flask, current_app
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+
+from auth import current_user_id
+from extensions import db
+from models import Video
+from services.events import Event, broker
+from services.library import add_to_library, add_video
+from services.resilience import UpstreamThrottledError
+from services.youtube_service import (
+    classify_fetch_error,
+    fetch_transcript,
+    fetch_video_metadata,
+    iter_collection_entries,
+)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_IN_FLIGHT = 8
+
+# Concurrent jobs share the upstream rate limiter; more would only queue
+MAX_ACTIVE_JOBS = 2
+
+# Finished jobs kept for status lookups, and per-job video errors reported
+MAX_JOBS_KEPT = 100
+MAX_ERRORS_KEPT = 50
+
+# Rate-limit/circuit rejections are waited out rather than failing the video
+MAX_THROTTLE_RETRIES = 5
+MAX_THROTTLE_WAIT = 30.0
+
+_jobs: OrderedDict[str, "ImportJob"] = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+class ImportBusyError(Exception):
+    """Raised when ``MAX_ACTIVE_JOBS`` imports are already running."""
+
+
+@dataclass
+class ImportJob:
+    """Progress of one playlist/channel import."""
+
+    id: str
+    url: str
+    user_id: int | None = None
+    status: str = QUEUED
+    enumerated: int = 0
+    skipped: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+    error_code: str | None = None
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    finished_at: str | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def record_error(self, video_id: str, error_code: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS_KEPT:
+            self.errors.append({"video_id": video_id, "error_code": error_code})
+
+    def publish(self) -> None:
+        broker.publish(Event("import-progress", self.to_dict(), user_id=self.user_id))
+
+
+def get_job(job_id: str) -> ImportJob | None:
+    return _jobs.get(job_id)
+
+
+def start_import(url: str) -> tuple[ImportJob, bool]:
+    """Start importing ``url`` in a background thread.
+
+    Videos are added to the requesting user's library (if authenticated).
+
+    Args:
+        url: A normalized playlist/channel URL.
+
+    Returns:
+        ``(job, created)``; the same user's import of the same URL that is
+        still running is returned instead of starting a second one.
+
+    Raises:
+        ImportBusyError: If ``MAX_ACTIVE_JOBS`` imports are running.
+    """
+    app = current_app._get_current_object()
+    user_id = current_user_id()
+    with _jobs_lock:
+        active = [job for job in _jobs.values() if job.active]
+        for job in active:
+            if job.url == url and job.user_id == user_id:
+                return job, False
+        if len(active) >= MAX_ACTIVE_JOBS:
+            raise ImportBusyError()
+
+        job = ImportJob(id=uuid.uuid4().hex, url=url, user_id=user_id)
+        _jobs[job.id] = job
+        finished = [j.id for j in _jobs.values() if not j.active]
+        for job_id in finished[: max(0, len(_jobs) - MAX_JOBS_KEPT)]:
+            del _jobs[job_id]
+
+    thread = threading.Thread(
+        target=_run_in_app_context, args=(app, job), name=f"import-{job.id[:8]}", daemon=True
+    )
+    thread.start()
+    return job, True
+
+
+def _run_in_app_context(app: Flask, job: ImportJob) -> None:
+    with app.app_context():
+        try:
+            run_import(
+                job,
+                batch_size=app.config["IMPORT_BATCH_SIZE"],
+                workers=app.config["IMPORT_WORKERS"],
+                max_in_flight=app.config["IMPORT_MAX_IN_FLIGHT"],
+            )
+        finally:
+            db.session.remove()
+
+
+def run_import(
+    job: ImportJob,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+) -> None:
+    """Run ``job`` to completion in the current thread (needs an app context)."""
+    job.status = RUNNING
+    job.publish()
+    try:
+        entries = iter_new_entries(job, iter_collection_entries(job.url), batch_size)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import-fetch") as pool:
+            pending: dict[Future, str] = {}
+            for entry in entries:
+                pending[pool.submit(_fetch, entry)] = entry["video_id"]
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _persist(job, pending.pop(future), future)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _persist(job, pending.pop(future), future)
+        job.status = DONE
+    except Exception as e:
+        db.session.rollback()
+        job.status = FAILED
+        job.error_code = _error_code(e)
+        current_app.logger.exception("Import %s of %s failed", job.id, job.url)
+    job.finished_at = datetime.now(timezone.utc).isoformat()
+    job.publish()
+
+
+def iter_new_entries(
+    job: ImportJob, entries: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[dict]:
+    """Yield entries whose video isn't stored yet, checking IDs in batches.
+
+    Duplicates within the collection are skipped too. Stored videos are
+    shared, so for a user's import they are only added to the library.
+    Counts enumerated and skipped entries on ``job``.
+    """
+    seen: set[str] = set()
+    for batch in itertools.batched(entries, batch_size):
+        ids = [entry["video_id"] for entry in batch]
+        if job.user_id is None:
+            existing = set(db.session.scalars(
+                select(Video.video_id).where(Video.video_id.in_(ids))
+            ))
+        else:
+            stored = db.session.scalars(
+                select(Video)
+                .options(load_only(Video.title, Video.duration, Video.thumbnail))
+                .where(Video.video_id.in_(ids))
+            ).all()
+            if add_to_library(job.user_id, stored):
+                db.session.commit()
+            existing = {video.video_id for video in stored}
+        for entry in batch:
+            job.enumerated += 1
+            video_id = entry["video_id"]
+            if video_id in existing or video_id in seen:
+                job.skipped += 1
+                continue
+            seen.add(video_id)
+            yield entry
+
+
+def _fetch(entry: dict) -> tuple[dict, list[dict]]:
+    """Worker: fetch metadata (unless the listing had it) and the transcript."""
+    video_id = entry["video_id"]
+    if entry.get("title") and entry.get("duration") is not None:
+        metadata = {
+            "title": entry["title"],
+            "duration": entry["duration"],
+            "thumbnail": entry.get("thumbnail") or "",
+        }
+    else:
+        metadata = _with_retries(fetch_video_metadata, video_id)
+    return metadata, _with_retries(fetch_transcript, video_id)
+
+
+def _with_retries(fn, video_id: str):
+    """Call ``fn(video_id)``, sleeping out rate-limit and open-circuit rejections."""
+    for attempt in itertools.count():
+        try:
+            return fn(video_id)
+        except UpstreamThrottledError as e:
+            if attempt >= MAX_THROTTLE_RETRIES:
+                raise
+            time.sleep(min(e.retry_after, MAX_THROTTLE_WAIT))
+
+
+def _persist(job: ImportJob, video_id: str, future: Future) -> None:
+    """Store one fetched video (or record its failure) and publish progress."""
+    try:
+        metadata, transcript = future.result()
+    except Exception as e:
+        job.record_error(video_id, _error_code(e))
+        job.publish()
+        return
+
+    # Added through POST /api/video since the batch lookup
+    existing = db.session.get(Video, video_id)
+    if existing is not None:
+        if job.user_id is not None and add_to_library(job.user_id, [existing]):
+            db.session.commit()
+        job.skipped += 1
+        job.publish()
+        return
+    try:
+        add_video(video_id, metadata, transcript, job.user_id)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        job.skipped += 1
+    else:
+        job.imported += 1
+    job.publish()
+
+
+def _error_code(error: Exception) -> str:
+    if isinstance(error, UpstreamThrottledError):
+        return error.error_code
+    return classify_fetch_error(error) or "FETCH_FAILED"
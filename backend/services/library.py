@@ -0,0 +1,162 @@
+"""Library persistence shared by single-video adds, imports and listings.
+
+Videos and transcripts are stored once and shared by all users; a user's
+library is the set of ``user_videos`` memberships. Unauthenticated
+requests (``user_id`` None) see the global library of every stored video.
+"""
+
+from sqlalchemy import delete, func, select
+
+from auth import user_filter
+from extensions import db
+from models import Progress, TranscriptSegmentation, UserVideo, Video
+from services.changelog import record_change, record_video_deletes
+from services.transcript_processing import process_transcript
+from services.youtube_service import DEFAULT_LANGUAGE
+
+
+def library_entry(video: Video) -> dict:
+    """Serialize a newly added video as it appears in ``GET /api/videos``."""
+    return {
+        "video_id": video.video_id,
+        "title": video.title,
+        "duration": video.duration,
+        "thumbnail": video.thumbnail,
+        "last_practiced": None,
+        "current_round": 0,
+    }
+
+
+def add_video(
+    video_id: str, metadata: dict, transcript: list[dict], user_id: int | None = None
+) -> Video:
+    """Store a fetched video with its precomputed segmentation (does not commit).
+
+    Args:
+        video_id: The 11-character YouTube video ID.
+        metadata: ``title``, ``duration`` and ``thumbnail``.
+        transcript: The default-language transcript fragments.
+        user_id: If given, the video is also added to this user's library.
+
+    Returns:
+        The new (flushed) Video.
+    """
+    video = Video(
+        video_id=video_id,
+        title=metadata["title"],
+        duration=metadata["duration"],
+        thumbnail=metadata["thumbnail"],
+        transcript_json=transcript,
+    )
+    processed = process_transcript(transcript)
+    db.session.add(video)
+    db.session.flush()  # no ORM relationship orders the inserts for us
+    record_change("video", "insert", video_id, video_id, library_entry(video))
+    db.session.add(TranscriptSegmentation(
+        video_id=video_id,
+        language=DEFAULT_LANGUAGE,
+        sentences_json=processed["sentences"],
+        chunks_json=processed["chunks"],
+    ))
+    if user_id is not None:
+        add_to_library(user_id, [video])
+    return video
+
+
+def add_to_library(user_id: int, videos: list[Video]) -> list[Video]:
+    """Add stored videos to a user's library, skipping members (does not commit).
+
+    Returns:
+        The videos that were newly added.
+    """
+    ids = [video.video_id for video in videos]
+    members = set(db.session.scalars(
+        select(UserVideo.video_id).where(UserVideo.user_id == user_id, UserVideo.video_id.in_(ids))
+    ))
+    added = [video for video in videos if video.video_id not in members]
+    for video in added:
+        db.session.add(UserVideo(user_id=user_id, video_id=video.video_id))
+        record_change(
+            "video", "insert", video.video_id, video.video_id, library_entry(video), user_id
+        )
+    return added
+
+
+def remove_from_library(user_id: int, video_ids: list[str]) -> list[str]:
+    """Remove videos and the user's progress on them from a library (does not commit).
+
+    The shared video rows are kept for other users.
+
+    Returns:
+        The IDs that were in the library.
+    """
+    removed = list(db.session.scalars(
+        select(UserVideo.video_id).where(
+            UserVideo.user_id == user_id, UserVideo.video_id.in_(video_ids)
+        )
+    ))
+    if not removed:
+        return []
+    db.session.execute(delete(Progress).where(
+        Progress.user_id == user_id, Progress.video_id.in_(removed)
+    ))
+    db.session.execute(delete(UserVideo).where(
+        UserVideo.user_id == user_id, UserVideo.video_id.in_(removed)
+    ))
+    record_video_deletes([(user_id, video_id) for video_id in removed])
+    return removed
+
+
+def library_entries(user_id: int | None) -> list[dict]:
+    """List a library with each video's latest progress in one query.
+
+    Args:
+        user_id: Whose library and progress to read; None for all stored
+            videos with unauthenticated progress.
+
+    Returns:
+        Entries as served by ``GET /api/videos``, most recently practiced
+        first (never-practiced videos last).
+    """
+    # SQLite returns the bare ``round`` column from the row holding max(created_at);
+    # the (user_id, video_id, created_at) index answers this without a table scan
+    latest = (
+        select(
+            Progress.video_id,
+            func.max(Progress.created_at).label("last_practiced"),
+            Progress.round,
+        )
+        .where(user_filter(Progress.user_id, user_id))
+        .group_by(Progress.video_id)
+        .subquery()
+    )
+    query = (
+        select(
+            Video.video_id,
+            Video.title,
+            Video.duration,
+            Video.thumbnail,
+            latest.c.last_practiced,
+            latest.c.round,
+        )
+        .outerjoin(latest, latest.c.video_id == Video.video_id)
+    )
+    if user_id is not None:
+        query = query.join(UserVideo, UserVideo.video_id == Video.video_id).where(
+            UserVideo.user_id == user_id
+        )
+
+    result = [
+        {
+            "video_id": row.video_id,
+            "title": row.title,
+            "duration": row.duration,
+            "thumbnail": row.thumbnail,
+            "last_practiced": row.last_practiced.isoformat() if row.last_practiced else None,
+            "current_round": row.round or 0,
+        }
+        for row in db.session.execute(query)
+    ]
+    # Sort by last_practiced descending (None values last)
+    result.sort(key=lambda x: x["last_practiced"] or "", reverse=True)
+    return result
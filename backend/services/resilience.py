@@ -0,0 +1,224 @@
+"""Token-bucket rate limiting and circuit breaking for upstream calls.
+
+``UpstreamGuard`` wraps a callable so that:
+
+* calls wait (briefly) for a rate-limit token, failing with
+  :class:`RateLimitedError` if none frees up within ``max_wait``;
+* after ``failure_threshold`` consecutive upstream failures the circuit
+  opens and calls fail immediately with :class:`CircuitOpenError` instead
+  of holding a worker for a full network timeout;
+* once ``reset_timeout`` has elapsed the circuit half-opens and lets a
+  single trial call through — success closes it, failure re-opens it.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Numeric encoding used for the exported state gauge
+STATE_VALUES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+
+class UpstreamThrottledError(Exception):
+    """Base for fail-fast rejections; carries an API error code and retry hint."""
+
+    error_code = "UPSTREAM_THROTTLED"
+
+    def __init__(self, upstream: str, retry_after: float) -> None:
+        self.upstream = upstream
+        self.retry_after = retry_after
+        super().__init__(f"Upstream '{upstream}' unavailable, retry in {retry_after:.0f}s")
+
+
+class CircuitOpenError(UpstreamThrottledError):
+    """Raised without calling upstream while the circuit is open."""
+
+    error_code = "UPSTREAM_CIRCUIT_OPEN"
+
+
+class RateLimitedError(UpstreamThrottledError):
+    """Raised when no rate-limit token became available in time."""
+
+    error_code = "UPSTREAM_RATE_LIMITED"
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens/second, bursts up to ``capacity``."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token if available.
+
+        Returns:
+            0.0 on success, otherwise the seconds until a token frees up.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, max_wait: float) -> bool:
+        """Take a token, sleeping up to ``max_wait`` seconds for one."""
+        deadline = self._clock() + max_wait
+        while True:
+            wait = self.try_acquire()
+            if wait == 0.0:
+                return True
+            if self._clock() + wait > deadline:
+                return False
+            self._sleep(wait)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a timed half-open trial."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        on_state_change: Callable[[str], None] | None = None,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._on_state_change = on_state_change
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            self._state = state
+            if self._on_state_change:
+                self._on_state_change(state)
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._set_state(HALF_OPEN)
+
+    def before_call(self) -> float:
+        """Reserve permission to call upstream.
+
+        Returns:
+            0.0 if the call may proceed, otherwise seconds until the next
+            half-open trial.
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return 0.0
+            if self._state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return 0.0
+            remaining = self.reset_timeout - (self._clock() - self._opened_at)
+            return max(remaining, 1.0)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._set_state(OPEN)
+
+    def release(self) -> None:
+        """Give back a reserved half-open trial that never reached upstream."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class UpstreamGuard:
+    """Rate limiter + circuit breaker in front of one upstream dependency.
+
+    Args:
+        name: Upstream name used in errors and metrics (e.g. ``"metadata"``).
+        limiter: Token bucket consulted before every call.
+        breaker: Circuit breaker tracking upstream health.
+        is_failure: Predicate deciding whether an exception indicates an
+            unhealthy upstream (timeouts, 429s, 5xx) rather than a normal
+            answer such as "this video has no transcript".
+        max_wait: Longest time a call may wait for a rate-limit token.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limiter: TokenBucket,
+        breaker: CircuitBreaker,
+        is_failure: Callable[[BaseException], bool],
+        max_wait: float = 2.0,
+    ) -> None:
+        self.name = name
+        self.limiter = limiter
+        self.breaker = breaker
+        self.is_failure = is_failure
+        self.max_wait = max_wait
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Invoke ``fn`` under the breaker and limiter, failing fast if either rejects."""
+        retry_after = self.breaker.before_call()
+        if retry_after:
+            raise CircuitOpenError(self.name, retry_after)
+        if not self.limiter.acquire(self.max_wait):
+            self.breaker.release()
+            raise RateLimitedError(self.name, 1 / self.limiter.rate)
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            # A definitive answer (e.g. "no transcript") still proves upstream is healthy
+            if self.is_failure(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except BaseException:
+            # Interrupted (e.g. GreenletExit, gevent.Timeout) with no verdict on
+            # upstream; free a half-open trial so the circuit can't stick open
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
@@ -0,0 +1,120 @@
+"""Post-processing of raw caption fragments into shadowing units.
+
+Auto-generated captions arrive as many short, overlapping fragments. This
+module merges them into sentence-aligned segments and groups sentences
+into practice chunks (loop ranges for pause-after-segment practice). It
+runs once per transcript, when the video is first fetched, and the result
+is stored alongside the transcript.
+"""
+
+import re
+
+# A fragment ending in terminal punctuation (optionally followed by a
+# closing quote or bracket) ends a sentence
+SENTENCE_END_PATTERN = re.compile(r"[.!?…。！？][\"'”’)\]]*$")
+
+# A silence longer than this between fragments also ends a sentence
+MAX_PAUSE_SECONDS = 1.5
+
+# Unpunctuated auto-captions are cut once a sentence reaches this length
+MAX_SENTENCE_SECONDS = 12.0
+
+# Chunks grow sentence by sentence until adding one would exceed this
+CHUNK_TARGET_SECONDS = 20.0
+
+
+def segment_sentences(transcript: list[dict]) -> list[dict]:
+    """Merge caption fragments into sentence-aligned segments.
+
+    Fragment end times are clipped to the next fragment's start so that
+    overlapping auto-caption timings don't inflate sentence durations.
+
+    Args:
+        transcript: Fragments with ``start``, ``duration`` and ``text``,
+            sorted by ``start``.
+
+    Returns:
+        Sentences with ``start``, ``duration``, ``text`` (the same shape as
+        transcript fragments) plus ``first_segment``/``last_segment``, the
+        inclusive range of fragment indexes each sentence covers.
+    """
+    count = len(transcript)
+    if not count:
+        return []
+
+    starts = [float(s["start"]) for s in transcript]
+    ends = [start + float(s["duration"]) for start, s in zip(starts, transcript)]
+    # Clip overlaps in one pass over the start/end arrays
+    for i in range(count - 1):
+        if starts[i] < starts[i + 1] < ends[i]:
+            ends[i] = starts[i + 1]
+
+    sentences = []
+    first = None
+    words: list[str] = []
+    for i, fragment in enumerate(transcript):
+        text = " ".join(fragment["text"].split())
+        if first is None:
+            first = i
+        if text:
+            words.append(text)
+
+        is_last = i == count - 1
+        boundary = (
+            is_last
+            or bool(SENTENCE_END_PATTERN.search(text))
+            or starts[i + 1] - ends[i] > MAX_PAUSE_SECONDS
+            or ends[i] - starts[first] >= MAX_SENTENCE_SECONDS
+        )
+        if boundary:
+            if words:
+                sentences.append({
+                    "start": round(starts[first], 2),
+                    "duration": round(ends[i] - starts[first], 2),
+                    "text": " ".join(words),
+                    "first_segment": first,
+                    "last_segment": i,
+                })
+            first = None
+            words = []
+    return sentences
+
+
+def build_chunks(sentences: list[dict], target_seconds: float = CHUNK_TARGET_SECONDS) -> list[dict]:
+    """Group consecutive sentences into practice chunks.
+
+    A chunk never splits a sentence; a single sentence longer than
+    ``target_seconds`` forms its own chunk.
+
+    Args:
+        sentences: Output of :func:`segment_sentences`.
+        target_seconds: Maximum chunk length when it can be respected.
+
+    Returns:
+        Chunks with ``start``, ``end`` (seconds, for loop ranges) and the
+        inclusive ``first_sentence``/``last_sentence`` indexes.
+    """
+    chunks = []
+    for i, sentence in enumerate(sentences):
+        end = sentence["start"] + sentence["duration"]
+        if chunks and end - chunks[-1]["start"] <= target_seconds:
+            chunks[-1]["end"] = round(end, 2)
+            chunks[-1]["last_sentence"] = i
+        else:
+            chunks.append({
+                "start": sentence["start"],
+                "end": round(end, 2),
+                "first_sentence": i,
+                "last_sentence": i,
+            })
+    return chunks
+
+
+def process_transcript(transcript: list[dict]) -> dict:
+    """Run the full post-processing stage for one transcript.
+
+    Returns:
+        A dict with ``sentences`` and ``chunks``.
+    """
+    sentences = segment_sentences(transcript)
+    return {"sentences": sentences, "chunks": build_chunks(sentences)}
@@ -1,15 +1,191 @@
-"""YouTube data-fetching helpers using yt-dlp and youtube-transcript-api."""
+"""YouTube data-fetching helpers using yt-dlp and youtube-transcript-api.
 
+Both libraries are imported on first use rather than at module load:
+yt-dlp alone pulls in hundreds of extractor modules, and only a cold
+``POST /api/video`` ever needs them. Error classification therefore
+checks exception types via :func:`_is_instance`, which never triggers an
+import.
+"""
+
+import itertools
 import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
 
-from youtube_transcript_api import YouTubeTranscriptApi
-from yt_dlp import YoutubeDL
+from extensions import metrics
+from services.fetch_cache import FetchCache
+from services.resilience import (
+    STATE_VALUES,
+    CircuitBreaker,
+    CircuitOpenError,
+    TokenBucket,
+    UpstreamGuard,
+    UpstreamThrottledError,
+)
 
 # Matches standard and short YouTube URLs
 YOUTUBE_URL_PATTERN = re.compile(
     r"(?:https?://)?(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([\w-]{11})"
 )
 
+# Playlist URLs (``/playlist?list=...``); ``watch?v=...&list=...`` stays a single video
+PLAYLIST_URL_PATTERN = re.compile(
+    r"(?:https?://)?(?:www\.|m\.)?youtube\.com/playlist\?(?:[^#]*&)?list=([\w-]+)"
+)
+
+# Channel URLs by handle, ID or legacy name, optionally with a tab
+CHANNEL_URL_PATTERN = re.compile(
+    r"(?:https?://)?(?:www\.|m\.)?youtube\.com/"
+    r"(@[\w.-]+|channel/UC[\w-]{22}|c/[\w.-]+|user/[\w.-]+)"
+    r"(?:/(videos|shorts|streams))?/?(?:[?#].*)?$"
+)
+
+# Fetch cache lifetimes (seconds). Negative entries expire sooner so a
+# video that gains captions or comes back online is picked up again.
+METADATA_TTL = 7 * 24 * 3600
+TRANSCRIPT_TTL = 7 * 24 * 3600
+TRANSCRIPT_UNAVAILABLE_TTL = 6 * 3600
+VIDEO_UNAVAILABLE_TTL = 15 * 60
+
+# DownloadError messages that indicate a transient failure (never cached)
+TRANSIENT_ERROR_PATTERN = re.compile(
+    r"HTTP Error (?:429|5\d\d)|timed out|Temporary failure|Connection (?:reset|refused)",
+    re.IGNORECASE,
+)
+
+# Language of the primary transcript stored with every video
+DEFAULT_LANGUAGE = "en"
+
+# In-process cache of track listings (signed caption URLs expire upstream)
+TRACK_LIST_TTL = 30 * 60
+TRACK_LIST_MAX_VIDEOS = 128
+
+# yt-dlp socket timeout (seconds) so a throttled upstream can't pin a worker
+UPSTREAM_TIMEOUT = 10
+
+# Playlist/channel page requests wait out rate-limit and open-circuit
+# rejections (up to this many times) rather than abandoning the listing
+PAGE_THROTTLE_RETRIES = 5
+PAGE_THROTTLE_MAX_WAIT = 30.0
+
+fetch_cache = FetchCache()
+
+_transcript_lists: OrderedDict[str, tuple[float, object]] = OrderedDict()
+_transcript_lists_lock = threading.Lock()
+
+
+class TranscriptUnavailableError(Exception):
+    """Raised from a cached negative result: the video has no transcript."""
+
+
+class VideoUnavailableError(Exception):
+    """Raised from a cached negative result: the video could not be fetched."""
+
+
+def _is_instance(error: BaseException, module_name: str, *class_names: str) -> bool:
+    """``isinstance`` against classes of ``module_name`` without importing it.
+
+    If the module was never imported, nothing can have raised its
+    exceptions, so the answer is simply False.
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        return False
+    return isinstance(error, tuple(getattr(module, name) for name in class_names))
+
+
+def classify_fetch_error(error: BaseException) -> str | None:
+    """Map an exception from the fetch helpers to an API error code.
+
+    Args:
+        error: Exception raised by :func:`fetch_video_metadata` or
+            :func:`fetch_transcript`.
+
+    Returns:
+        ``"TRANSCRIPT_UNAVAILABLE"``, ``"VIDEO_UNAVAILABLE"``, or None if
+        the error isn't a known upstream failure.
+    """
+    if isinstance(error, TranscriptUnavailableError) or _is_instance(
+        error,
+        "youtube_transcript_api",
+        "NoTranscriptFound",
+        "TranscriptsDisabled",
+        "NotTranslatable",
+        "TranslationLanguageNotAvailable",
+    ):
+        return "TRANSCRIPT_UNAVAILABLE"
+    if isinstance(error, VideoUnavailableError) or _is_instance(
+        error, "yt_dlp.utils", "DownloadError"
+    ):
+        return "VIDEO_UNAVAILABLE"
+    return None
+
+
+def _is_upstream_failure(error: BaseException) -> bool:
+    """Return True if ``error`` means YouTube is throttling us or unreachable."""
+    if _is_instance(error, "yt_dlp.networking.exceptions", "TransportError"):
+        return True
+    if _is_instance(error, "yt_dlp.utils", "DownloadError") or _is_instance(
+        error, "yt_dlp.networking.exceptions", "HTTPError"
+    ):
+        return bool(TRANSIENT_ERROR_PATTERN.search(str(error)))
+    if _is_instance(error, "youtube_transcript_api", "RequestBlocked", "YouTubeRequestFailed"):
+        return True
+    # Socket timeouts, refused connections, and requests' ConnectionError
+    return isinstance(error, OSError)
+
+
+def _make_guard(
+    name: str, rate: float, burst: int, failure_threshold: int, reset_timeout: float
+) -> UpstreamGuard:
+    return UpstreamGuard(
+        name,
+        TokenBucket(rate, burst),
+        CircuitBreaker(failure_threshold, reset_timeout),
+        is_failure=_is_upstream_failure,
+    )
+
+
+guards: dict[str, UpstreamGuard] = {}
+
+
+def configure_guards(
+    rate: float = 1.0, burst: int = 5, failure_threshold: int = 5, reset_timeout: float = 30.0
+) -> None:
+    """(Re)create the rate limiter + circuit breaker for each upstream.
+
+    Args:
+        rate: Sustained upstream calls per second, per upstream.
+        burst: Calls allowed back-to-back before the rate applies.
+        failure_threshold: Consecutive failures that open the circuit.
+        reset_timeout: Seconds the circuit stays open before a trial call.
+    """
+    for name in ("metadata", "transcript"):
+        guards[name] = _make_guard(name, rate, burst, failure_threshold, reset_timeout)
+
+
+configure_guards()
+
+metrics.register_gauge(
+    "shadowing_upstream_circuit_state",
+    "Upstream circuit breaker state (0=closed, 1=open, 2=half-open).",
+    ("operation",),
+    lambda: {(name,): STATE_VALUES[g.breaker.state] for name, g in guards.items()},
+)
+
+
+def _guarded_call(name: str, fn, *args):
+    """Run an uncached upstream fetch through the guard for ``name``."""
+    try:
+        return guards[name].call(fn, *args)
+    except UpstreamThrottledError as e:
+        reason = "circuit_open" if isinstance(e, CircuitOpenError) else "rate_limited"
+        metrics.record_upstream_rejection(name, reason)
+        raise
+
 
 def extract_video_id(url: str) -> str | None:
     """Extract the 11-character video ID from a YouTube URL.
@@ -24,6 +200,93 @@ def extract_video_id(url: str) -> str | None:
     return match.group(1) if match else None
 
 
+def extract_collection_url(url: str) -> str | None:
+    """Normalize a playlist or channel URL for flat enumeration.
+
+    Channel URLs without a tab point at the ``/videos`` tab; the channel
+    root would otherwise list its tabs rather than its videos.
+
+    Args:
+        url: A YouTube playlist or channel URL.
+
+    Returns:
+        The canonical ``https://www.youtube.com/...`` URL, or None if
+        ``url`` is neither a playlist nor a channel.
+    """
+    match = PLAYLIST_URL_PATTERN.search(url)
+    if match:
+        return f"https://www.youtube.com/playlist?list={match.group(1)}"
+    match = CHANNEL_URL_PATTERN.search(url)
+    if match:
+        return f"https://www.youtube.com/{match.group(1)}/{match.group(2) or 'videos'}"
+    return None
+
+
+def iter_collection_entries(url: str) -> Iterator[dict]:
+    """Lazily enumerate the videos of a playlist or channel.
+
+    Uses yt-dlp's flat extraction without processing the result, so
+    ``entries`` stays a generator that requests further pages only as it
+    is consumed; a 2,000-video channel is never held in memory at once.
+    Every HTTP request (the first page and each continuation) goes through
+    the ``metadata`` upstream guard; a rejected request is retried after
+    the suggested wait, up to :data:`PAGE_THROTTLE_RETRIES` times.
+
+    Args:
+        url: A URL returned by :func:`extract_collection_url`.
+
+    Yields:
+        Dicts with ``video_id`` and whatever of ``title``, ``duration``
+        and ``thumbnail`` the listing includes (None when missing).
+    """
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        "extract_flat": "in_playlist",
+        "lazy_playlist": True,
+        "socket_timeout": UPSTREAM_TIMEOUT,
+    }
+    from yt_dlp import YoutubeDL
+
+    with YoutubeDL(ydl_opts) as ydl:
+        # Pages are requested lazily while iterating, so guard yt-dlp's
+        # requests themselves rather than just the extract_info() call
+        ydl.urlopen = _guarded_page_request(ydl.urlopen)
+        info = ydl.extract_info(url, download=False, process=False)
+        for entry in info.get("entries") or ():
+            video_id = entry.get("id") if entry else None
+            if not video_id or not re.fullmatch(r"[\w-]{11}", video_id):
+                continue  # nested tabs/playlists or unavailable entries
+            thumbnails = entry.get("thumbnails") or []
+            duration = entry.get("duration")
+            yield {
+                "video_id": video_id,
+                "title": entry.get("title"),
+                "duration": int(duration) if duration else None,
+                "thumbnail": thumbnails[-1].get("url") if thumbnails else None,
+            }
+
+
+def _guarded_page_request(urlopen):
+    """Wrap ``YoutubeDL.urlopen`` so each request passes the ``metadata`` guard."""
+
+    def timed(req):
+        with metrics.time_upstream("playlist"):
+            return urlopen(req)
+
+    def request(req):
+        for attempt in itertools.count():
+            try:
+                return _guarded_call("metadata", timed, req)
+            except UpstreamThrottledError as e:
+                if attempt >= PAGE_THROTTLE_RETRIES:
+                    raise
+                time.sleep(min(e.retry_after, PAGE_THROTTLE_MAX_WAIT))
+
+    return request
+
+
 def fetch_video_metadata(video_id: str) -> dict:
     """Fetch video title, duration, and thumbnail via yt-dlp (no download).
 
@@ -37,13 +300,40 @@ def fetch_video_metadata(video_id: str) -> dict:
     Raises:
         yt_dlp.utils.DownloadError: If the video is unavailable or the
             network request fails.
+        VideoUnavailableError: If a recent fetch for this video already
+            failed (served from the fetch cache).
+        services.resilience.UpstreamThrottledError: If the circuit is open
+            or the rate limit was exceeded (no request was made).
     """
+    key = f"metadata:{video_id}"
+    entry = fetch_cache.get(key)
+    metrics.record_cache("fetch_metadata", hit=entry is not None)
+    if entry is not None:
+        if entry.error_code:
+            raise VideoUnavailableError(entry.error_message)
+        return entry.value
+
+    try:
+        metadata = _guarded_call("metadata", _fetch_video_metadata_uncached, video_id)
+    except Exception as e:
+        if classify_fetch_error(e) == "VIDEO_UNAVAILABLE" and not _is_upstream_failure(e):
+            fetch_cache.set_error(key, "VIDEO_UNAVAILABLE", str(e), VIDEO_UNAVAILABLE_TTL)
+        raise
+    fetch_cache.set(key, metadata, METADATA_TTL)
+    return metadata
+
+
+def _fetch_video_metadata_uncached(video_id: str) -> dict:
+    """Call yt-dlp for ``video_id`` without consulting the fetch cache."""
     ydl_opts = {
         "quiet": True,
         "no_warnings": True,
         "skip_download": True,
+        "socket_timeout": UPSTREAM_TIMEOUT,
     }
-    with YoutubeDL(ydl_opts) as ydl:
+    from yt_dlp import YoutubeDL
+
+    with metrics.time_upstream("metadata"), YoutubeDL(ydl_opts) as ydl:
         info = ydl.extract_info(
             f"https://www.youtube.com/watch?v={video_id}", download=False
         )
@@ -55,24 +345,153 @@ def fetch_video_metadata(video_id: str) -> dict:
     }
 
 
-def fetch_transcript(video_id: str) -> list[dict]:
-    """Fetch English transcript, falling back to auto-generated captions.
+def fetch_transcript(video_id: str, language: str = DEFAULT_LANGUAGE) -> list[dict]:
+    """Fetch a transcript in ``language``, translating one if necessary.
+
+    A native track (manual, then auto-generated) is preferred; otherwise,
+    for languages other than :data:`DEFAULT_LANGUAGE`, a translatable track
+    is machine-translated by YouTube. The video's track
+    list is requested at most once per :data:`TRACK_LIST_TTL`, however many
+    languages are fetched.
 
     Args:
         video_id: An 11-character YouTube video ID.
+        language: Language code, e.g. ``"en"`` or ``"zh-Hant"``.
 
     Returns:
         A list of dicts, each with ``start`` (seconds), ``duration``
         (seconds), and ``text``.
 
     Raises:
-        youtube_transcript_api.NoTranscriptFound: If no English transcript
-            (manual or auto-generated) is available.
+        youtube_transcript_api.NoTranscriptFound: If no track in
+            ``language`` exists and none can (or may) be translated into it.
+        youtube_transcript_api.TranscriptsDisabled: If the video has
+            transcripts disabled entirely.
+        TranscriptUnavailableError: If a recent fetch already found no
+            transcript (served from the fetch cache).
+        services.resilience.UpstreamThrottledError: If the circuit is open
+            or the rate limit was exceeded (no request was made).
+    """
+    key = f"transcript:{video_id}:{language}"
+    entry = fetch_cache.get(key)
+    metrics.record_cache("fetch_transcript", hit=entry is not None)
+    if entry is not None:
+        if entry.error_code:
+            raise TranscriptUnavailableError(entry.error_message)
+        return entry.value
+
+    try:
+        transcript = _guarded_call("transcript", _fetch_transcript_uncached, video_id, language)
+    except Exception as e:
+        if classify_fetch_error(e) == "TRANSCRIPT_UNAVAILABLE":
+            fetch_cache.set_error(
+                key, "TRANSCRIPT_UNAVAILABLE", type(e).__name__, TRANSCRIPT_UNAVAILABLE_TTL
+            )
+        raise
+    fetch_cache.set(key, transcript, TRANSCRIPT_TTL)
+    return transcript
+
+
+def list_transcript_languages(video_id: str) -> dict:
+    """Describe the transcript tracks available for a video.
+
+    Args:
+        video_id: An 11-character YouTube video ID.
+
+    Returns:
+        A dict with ``tracks`` (native tracks: ``language_code``,
+        ``language``, ``is_generated``, ``is_translatable``) and
+        ``translation_languages`` (codes YouTube can translate into).
+
+    Raises:
         youtube_transcript_api.TranscriptsDisabled: If the video has
             transcripts disabled entirely.
+        services.resilience.UpstreamThrottledError: If the circuit is open
+            or the rate limit was exceeded (no request was made).
     """
-    ytt_api = YouTubeTranscriptApi()
-    transcript = ytt_api.fetch(video_id, languages=["en"])
+    key = f"tracks:{video_id}"
+    entry = fetch_cache.get(key)
+    metrics.record_cache("fetch_tracks", hit=entry is not None)
+    if entry is not None and not entry.error_code:
+        return entry.value
+
+    transcript_list = _guarded_call("transcript", _get_transcript_list, video_id)
+    tracks = list(transcript_list)
+    translation_languages: dict[str, str] = {}
+    for track in tracks:
+        for lang in track.translation_languages:
+            translation_languages.setdefault(lang.language_code, lang.language)
+    result = {
+        "tracks": [
+            {
+                "language_code": t.language_code,
+                "language": t.language,
+                "is_generated": t.is_generated,
+                "is_translatable": t.is_translatable,
+            }
+            for t in tracks
+        ],
+        "translation_languages": [
+            {"language_code": code, "language": name}
+            for code, name in sorted(translation_languages.items())
+        ],
+    }
+    fetch_cache.set(key, result, TRANSCRIPT_TTL)
+    return result
+
+
+def _get_transcript_list(video_id: str):
+    """Return the video's TranscriptList, listing it upstream at most once per TTL.
+
+    Track objects hold signed caption URLs and an HTTP session, so they are
+    kept in a small in-process LRU rather than in the disk cache.
+    """
+    now = time.monotonic()
+    with _transcript_lists_lock:
+        cached = _transcript_lists.get(video_id)
+        if cached is not None and now - cached[0] < TRACK_LIST_TTL:
+            _transcript_lists.move_to_end(video_id)
+            return cached[1]
+
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    with metrics.time_upstream("transcript_list"):
+        transcript_list = YouTubeTranscriptApi().list(video_id)
+
+    with _transcript_lists_lock:
+        _transcript_lists[video_id] = (now, transcript_list)
+        _transcript_lists.move_to_end(video_id)
+        while len(_transcript_lists) > TRACK_LIST_MAX_VIDEOS:
+            _transcript_lists.popitem(last=False)
+    return transcript_list
+
+
+def _fetch_transcript_uncached(video_id: str, language: str = DEFAULT_LANGUAGE) -> list[dict]:
+    """Fetch (or translate) ``language`` via youtube-transcript-api, bypassing the fetch cache.
+
+    The default language is the primary transcript, which must match the
+    spoken audio, so it is never machine-translated from another track.
+    """
+    from youtube_transcript_api import NoTranscriptFound
+
+    transcript_list = _get_transcript_list(video_id)
+    try:
+        track = transcript_list.find_transcript([language])
+    except NoTranscriptFound:
+        if language == DEFAULT_LANGUAGE:
+            raise
+        sources = [
+            t for t in transcript_list
+            if any(lang.language_code == language for lang in t.translation_languages)
+        ]
+        # Prefer translating from the default language, then manual captions
+        sources.sort(key=lambda t: (t.language_code != DEFAULT_LANGUAGE, t.is_generated))
+        if not sources:
+            raise
+        track = sources[0].translate(language)
+
+    with metrics.time_upstream("transcript"):
+        transcript = track.fetch()
     return [
         {
             "start": round(snippet.start, 2),
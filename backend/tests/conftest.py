@@ -8,6 +8,13 @@ from flask_sqlalchemy import SQLAlchemy
 from app import create_app
 from extensions import db as _db
 from models import Video
+from services.youtube_service import configure_guards
+
+
+@pytest.fixture(autouse=True)
+def fresh_upstream_guards() -> None:
+    """Reset rate limiters/circuit breakers so tests never wait on each other."""
+    configure_guards(rate=1000, burst=1000)
 
 
 @pytest.fixture()
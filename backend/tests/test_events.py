@@ -0,0 +1,144 @@
+"""Tests for the in-process event broker and the SSE stream."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app
+from models import SyncCheckpoint
+from services.events import Event, EventBroker, broker
+
+METADATA = {"title": "Test Video", "duration": 120, "thumbnail": "https://img.youtube.com/t.jpg"}
+TRANSCRIPT = [{"start": 0.0, "duration": 2.0, "text": "Hello world."}]
+
+
+@pytest.fixture()
+def app():
+    """App with a short heartbeat so idle streams yield quickly."""
+    return create_app(testing=True, config={"EVENTS_HEARTBEAT_SECONDS": 0.01})
+
+
+def _add_video(client, video_id: str = "dQw4w9WgXcQ"):
+    with patch("routes.video.fetch_video_metadata", return_value=METADATA), \
+            patch("routes.video.fetch_transcript", return_value=TRANSCRIPT):
+        return client.post("/api/video", json={"url": f"https://youtu.be/{video_id}"})
+
+
+def _parse(chunk: bytes) -> dict:
+    """Parse one SSE message into its fields (``data`` JSON-decoded)."""
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().splitlines())
+    if "data" in fields:
+        fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+def _next_event(stream) -> dict:
+    """Return the next non-heartbeat message from a streamed response."""
+    for chunk in stream:
+        if not chunk.startswith((b":", b"retry:")):
+            return _parse(chunk)
+    raise AssertionError("stream ended")
+
+
+class TestEventBroker:
+    """EventBroker — fan-out and slow-subscriber handling."""
+
+    def test_publishes_to_every_subscriber(self):
+        events = EventBroker()
+        first, second = events.subscribe(), events.subscribe()
+        events.publish(Event("ping", {}))
+        assert first.get(timeout=0).type == "ping"
+        assert second.get(timeout=0).type == "ping"
+
+    def test_unsubscribed_receives_nothing(self):
+        events = EventBroker()
+        subscription = events.subscribe()
+        events.unsubscribe(subscription)
+        events.publish(Event("ping", {}))
+        assert subscription.get(timeout=0) is None
+
+    def test_overflowing_subscriber_is_dropped(self):
+        events = EventBroker(queue_size=2)
+        slow = events.subscribe()
+        for _ in range(3):
+            events.publish(Event("ping", {}))
+        assert slow.overflowed
+        assert events.subscriber_count == 0
+
+
+class TestEventStream:
+    """GET /api/events — change events published on commit."""
+
+    def test_headers_and_heartbeat(self, client, db):
+        resp = client.get("/api/events")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/event-stream"
+        assert resp.headers["Cache-Control"] == "no-cache"
+        stream = iter(resp.response)
+        assert next(stream).startswith(b"retry:")
+        assert next(stream) == b": heartbeat\n\n"
+        resp.close()
+        assert broker.subscriber_count == 0
+
+    @pytest.mark.parametrize("method", ["GET", "HEAD"])
+    def test_unread_stream_unsubscribes_on_close(self, client, db, method):
+        # HEAD, or a client gone before the first chunk, never starts the stream
+        resp = client.open("/api/events", method=method)
+        assert broker.subscriber_count == 1
+        resp.close()
+        assert broker.subscriber_count == 0
+
+    def test_video_and_progress_events(self, client, db):
+        resp = client.get("/api/events")
+        stream = iter(resp.response)
+
+        _add_video(client)
+        created = _next_event(stream)
+        assert created["event"] == "video-created"
+        assert created["data"]["id"] == "dQw4w9WgXcQ"
+        assert created["data"]["data"]["title"] == "Test Video"
+        assert int(created["id"]) == created["data"]["seq"]
+
+        client.post("/api/progress", json={"video_id": "dQw4w9WgXcQ", "round": 1, "step": 2})
+        progress = _next_event(stream)
+        assert progress["event"] == "progress-created"
+        assert progress["data"]["data"]["step"] == 2
+
+        client.delete("/api/videos", json={"video_ids": ["dQw4w9WgXcQ"]})
+        assert _next_event(stream)["event"] == "video-deleted"
+        resp.close()
+
+    def test_rolled_back_changes_are_not_published(self, client, db):
+        resp = client.get("/api/events")
+        stream = iter(resp.response)
+        next(stream)
+
+        with patch("services.library.process_transcript", side_effect=RuntimeError("boom")):
+            assert _add_video(client).status_code == 500
+        db.session.rollback()
+        assert next(stream) == b": heartbeat\n\n"
+        resp.close()
+
+    def test_resume_replays_missed_changes(self, client, db):
+        _add_video(client, "aaaaaaaaaaa")
+        first_seq = client.get("/api/sync").get_json()["latest_seq"]
+        _add_video(client, "bbbbbbbbbbb")
+
+        resp = client.get("/api/events", headers={"Last-Event-ID": str(first_seq)})
+        replayed = _next_event(iter(resp.response))
+        assert replayed["event"] == "video-created"
+        assert replayed["data"]["id"] == "bbbbbbbbbbb"
+        resp.close()
+
+    def test_resume_before_truncation_sends_reset(self, client, db):
+        db.session.add(SyncCheckpoint(id=1, truncated_through=10))
+        db.session.commit()
+        resp = client.get("/api/events?since=3")
+        assert _next_event(iter(resp.response))["event"] == "reset"
+        resp.close()
+
+    def test_invalid_resume_position(self, client, db):
+        resp = client.get("/api/events", headers={"Last-Event-ID": "abc"})
+        assert resp.status_code == 400
+        assert broker.subscriber_count == 0
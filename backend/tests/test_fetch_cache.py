@@ -0,0 +1,75 @@
+"""Tests for the disk-backed upstream FetchCache."""
+
+import pytest
+
+from services.fetch_cache import FetchCache
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture()
+def cache(tmp_path, clock) -> FetchCache:
+    cache = FetchCache(clock=clock)
+    cache.configure(str(tmp_path / "cache.sqlite3"))
+    return cache
+
+
+class TestFetchCache:
+    """FetchCache — TTL, negative entries, and size-bounded eviction."""
+
+    def test_disabled_without_path(self):
+        cache = FetchCache()
+        cache.set("k", {"a": 1}, ttl=60)
+        assert cache.get("k") is None
+
+    def test_roundtrip_value(self, cache):
+        cache.set("metadata:abc", {"title": "T"}, ttl=60)
+        entry = cache.get("metadata:abc")
+        assert entry.value == {"title": "T"}
+        assert entry.error_code is None
+
+    def test_expired_entry_is_miss(self, cache, clock):
+        cache.set("k", [1, 2], ttl=60)
+        clock.now += 61
+        assert cache.get("k") is None
+
+    def test_negative_entry(self, cache):
+        cache.set_error("k", "TRANSCRIPT_UNAVAILABLE", "NoTranscriptFound", ttl=30)
+        entry = cache.get("k")
+        assert entry.value is None
+        assert entry.error_code == "TRANSCRIPT_UNAVAILABLE"
+        assert entry.error_message == "NoTranscriptFound"
+
+    def test_persists_across_instances(self, cache, tmp_path, clock):
+        cache.set("k", "v", ttl=60)
+        other = FetchCache(clock=clock)
+        other.configure(str(tmp_path / "cache.sqlite3"))
+        assert other.get("k").value == "v"
+
+    def test_evicts_least_recently_used_over_max_bytes(self, tmp_path, clock):
+        cache = FetchCache(clock=clock)
+        cache.configure(str(tmp_path / "cache.sqlite3"), max_bytes=300)
+        for key in ("a", "b", "c"):
+            cache.set(key, "x" * 90, ttl=60)
+            clock.now += 1
+        # Touch "a" so "b" becomes the least recently used entry
+        cache.get("a")
+        clock.now += 1
+        cache.set("d", "x" * 90, ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("d") is not None
@@ -0,0 +1,163 @@
+"""Tests for playlist/channel imports (pipeline and endpoints)."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from models import ChangeLog, Video
+from services import importer
+from services.importer import DONE, ImportJob, iter_new_entries, run_import
+from services.youtube_service import TranscriptUnavailableError
+
+TRANSCRIPT = [{"start": 0.0, "duration": 2.0, "text": "Hello world."}]
+CHANNEL_URL = "https://www.youtube.com/@chan/videos"
+
+
+def _entry(i: int, **overrides) -> dict:
+    entry = {"video_id": f"vid{i:08d}", "title": f"Video {i}", "duration": 60, "thumbnail": ""}
+    entry.update(overrides)
+    return entry
+
+
+@pytest.fixture(autouse=True)
+def clear_jobs():
+    importer._jobs.clear()
+    yield
+    importer._jobs.clear()
+
+
+class TestIterNewEntries:
+    """iter_new_entries() — batched lookups against the videos table."""
+
+    def test_skips_stored_and_duplicate_ids(self, db, sample_video):
+        job = ImportJob(id="j", url=CHANNEL_URL)
+        entries = [_entry(1), {"video_id": sample_video.video_id}, _entry(2), _entry(1)]
+        new = [e["video_id"] for e in iter_new_entries(job, entries, batch_size=2)]
+        assert new == ["vid00000001", "vid00000002"]
+        assert (job.enumerated, job.skipped) == (4, 2)
+
+    def test_one_query_per_batch(self, db):
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            list(iter_new_entries(ImportJob(id="j", url=CHANNEL_URL),
+                                  (_entry(i) for i in range(25)), batch_size=10))
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+        assert len(statements) == 3
+
+
+class TestRunImport:
+    """run_import() — fetch pipeline and persistence."""
+
+    @patch("services.importer.fetch_video_metadata")
+    @patch("services.importer.fetch_transcript")
+    def test_imports_new_videos(self, mock_transcript, mock_metadata, db, sample_video):
+        def transcript(video_id):
+            if video_id == "vid00000003":
+                raise TranscriptUnavailableError(video_id)
+            return TRANSCRIPT
+
+        mock_transcript.side_effect = transcript
+        mock_metadata.return_value = {"title": "Fetched", "duration": 5, "thumbnail": ""}
+        entries = [_entry(1), _entry(2, title=None), _entry(3), {"video_id": sample_video.video_id}]
+
+        job = ImportJob(id="j", url=CHANNEL_URL)
+        with patch("services.importer.iter_collection_entries", return_value=iter(entries)):
+            run_import(job, batch_size=2, workers=2, max_in_flight=2)
+
+        assert job.status == DONE
+        assert (job.enumerated, job.imported, job.skipped, job.failed) == (4, 2, 1, 1)
+        assert job.errors == [{"video_id": "vid00000003", "error_code": "TRANSCRIPT_UNAVAILABLE"}]
+        # Listing metadata is used when complete; only the untitled entry was fetched
+        mock_metadata.assert_called_once_with("vid00000002")
+        assert db.session.get(Video, "vid00000002").title == "Fetched"
+        assert db.session.query(ChangeLog).filter_by(op="insert").count() == 2
+
+    def test_enumeration_failure_fails_job(self, db):
+        job = ImportJob(id="j", url=CHANNEL_URL)
+        with patch("services.importer.iter_collection_entries",
+                   side_effect=TranscriptUnavailableError("x")):
+            run_import(job)
+        assert job.status == importer.FAILED
+        assert job.error_code == "TRANSCRIPT_UNAVAILABLE"
+
+    def test_backpressure_bounds_enumeration(self, app, db):
+        pulled = []
+        gate = threading.Event()
+
+        def source(url):
+            for i in range(100):
+                pulled.append(i)
+                yield _entry(i)
+
+        def slow_transcript(video_id):
+            gate.wait(5)
+            return TRANSCRIPT
+
+        job = ImportJob(id="j", url=CHANNEL_URL)
+
+        def run():
+            with app.app_context():
+                run_import(job, batch_size=10, workers=2, max_in_flight=4)
+
+        with patch("services.importer.iter_collection_entries", source), \
+                patch("services.importer.fetch_transcript", slow_transcript):
+            thread = threading.Thread(target=run)
+            thread.start()
+            time.sleep(0.2)
+            # One lookup batch is read ahead; the rest waits for the pool
+            assert len(pulled) == 10
+            gate.set()
+            thread.join(10)
+
+        assert job.imported == 100
+
+
+class TestImportRoutes:
+    """POST /api/import and GET /api/import/<job_id>."""
+
+    def test_rejects_non_collection_url(self, client):
+        resp = client.post("/api/import", json={"url": "https://youtu.be/dQw4w9WgXcQ"})
+        assert resp.status_code == 400
+        assert client.post("/api/import", json={}).status_code == 400
+
+    def test_unknown_job_returns_404(self, client):
+        assert client.get("/api/import/nope").status_code == 404
+
+    @patch("services.importer.fetch_transcript", return_value=TRANSCRIPT)
+    def test_runs_job_in_background(self, mock_transcript, client, db):
+        with patch("services.importer.iter_collection_entries",
+                   return_value=iter([_entry(1), _entry(2)])):
+            resp = client.post("/api/import", json={"url": "https://www.youtube.com/@chan"})
+            assert resp.status_code == 202
+            job_id = resp.get_json()["id"]
+            assert resp.get_json()["url"] == CHANNEL_URL
+
+            deadline = time.monotonic() + 5
+            while (status := client.get(f"/api/import/{job_id}").get_json())["status"] != DONE:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+        assert status["imported"] == 2
+        assert {v["video_id"] for v in client.get("/api/videos").get_json()} == {
+            "vid00000001", "vid00000002",
+        }
+
+    def test_same_url_reuses_running_job(self, client):
+        job = ImportJob(id="running", url=CHANNEL_URL, status=importer.RUNNING)
+        importer._jobs[job.id] = job
+        resp = client.post("/api/import", json={"url": CHANNEL_URL})
+        assert resp.status_code == 200
+        assert resp.get_json()["id"] == "running"
+
+    def test_too_many_active_jobs(self, client):
+        for i in range(importer.MAX_ACTIVE_JOBS):
+            importer._jobs[str(i)] = ImportJob(id=str(i), url=f"{CHANNEL_URL}{i}")
+        resp = client.post("/api/import", json={"url": CHANNEL_URL})
+        assert resp.status_code == 429
+        assert resp.get_json()["error_code"] == "IMPORT_BUSY"
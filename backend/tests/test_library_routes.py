@@ -1,6 +1,9 @@
 """Tests for the video library endpoints (list, get, delete)."""
 
+from sqlalchemy import text
+
 from models import Progress, Video
+from routes.video import MAX_BULK_DELETE
 
 
 class TestGetVideos:
@@ -122,3 +125,52 @@ class TestDeleteVideo:
             video_id=sample_video.video_id
         ).count()
         assert remaining == 0
+
+    def test_database_cascades_progress(self, db, sample_video):
+        db.session.add(Progress(video_id=sample_video.video_id, round=1, step=1))
+        db.session.commit()
+
+        # Raw DELETE bypasses the ORM entirely — ON DELETE CASCADE must fire
+        db.session.execute(text("DELETE FROM videos"))
+        db.session.commit()
+        assert db.session.query(Progress).count() == 0
+
+
+class TestBulkDeleteVideos:
+    """DELETE /api/videos — remove many videos in one transaction."""
+
+    def _add_videos(self, db, ids):
+        for vid in ids:
+            db.session.add(Video(video_id=vid, title=vid, duration=1, transcript_json=[]))
+            db.session.add(Progress(video_id=vid, round=1, step=1))
+        db.session.commit()
+
+    def test_missing_body(self, client, db):
+        resp = client.delete("/api/videos")
+        assert resp.status_code == 400
+
+    def test_empty_list(self, client, db):
+        resp = client.delete("/api/videos", json={"video_ids": []})
+        assert resp.status_code == 400
+
+    def test_non_string_ids(self, client, db):
+        resp = client.delete("/api/videos", json={"video_ids": [1, 2]})
+        assert resp.status_code == 400
+
+    def test_too_many_ids(self, client, db):
+        ids = [f"v{i}" for i in range(MAX_BULK_DELETE + 1)]
+        resp = client.delete("/api/videos", json={"video_ids": ids})
+        assert resp.status_code == 400
+
+    def test_deletes_videos_and_progress(self, client, db):
+        self._add_videos(db, ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"])
+
+        resp = client.delete(
+            "/api/videos", json={"video_ids": ["aaaaaaaaaaa", "bbbbbbbbbbb", "zzzzzzzzzzz"]}
+        )
+        assert resp.status_code == 200
+        assert resp.get_json() == {"deleted": 2, "not_found": ["zzzzzzzzzzz"], "in_use": []}
+
+        db.session.expire_all()
+        assert [v.video_id for v in db.session.query(Video).all()] == ["ccccccccccc"]
+        assert db.session.query(Progress).count() == 1
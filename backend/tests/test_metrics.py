@@ -0,0 +1,113 @@
+"""Tests for request/SQL/upstream instrumentation and GET /api/metrics."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from extensions import metrics
+from models import Progress, Video
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test with an empty metrics registry."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _metric_lines(client, prefix: str) -> list[str]:
+    body = client.get("/api/metrics").get_data(as_text=True)
+    return [line for line in body.splitlines() if line.startswith(prefix)]
+
+
+class TestMetricsEndpoint:
+    """GET /api/metrics — Prometheus text exposition."""
+
+    def test_returns_prometheus_text(self, client):
+        resp = client.get("/api/metrics")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/plain"
+        assert "# TYPE shadowing_request_duration_seconds histogram" in resp.get_data(as_text=True)
+
+    def test_records_request_latency_by_endpoint(self, client, db):
+        client.get("/api/videos")
+        client.get("/api/videos")
+        lines = _metric_lines(client, "shadowing_request_duration_seconds_count")
+        assert (
+            'shadowing_request_duration_seconds_count{endpoint="video.list_videos",'
+            'method="GET",status="200"} 2'
+        ) in lines
+
+    def test_counts_sql_queries_per_request(self, client, db):
+        for i in range(3):
+            db.session.add(Video(
+                video_id=f"vid{i:08d}",
+                title=f"Video {i}",
+                duration=60,
+                transcript_json=[],
+            ))
+        db.session.commit()
+
+        client.get("/api/videos")
+        lines = _metric_lines(client, "shadowing_request_sql_queries_sum")
+        # Videos and their latest progress come from a single grouped query
+        assert (
+            'shadowing_request_sql_queries_sum{endpoint="video.list_videos",method="GET"} 1.0'
+        ) in lines
+
+    def test_failed_statement_leaves_no_timing_state(self, db):
+        with db.engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+            conn.rollback()
+            conn.execute(text("SELECT 1"))
+            assert not any(key.startswith("_metrics") for key in conn.info)
+        rendered = metrics.render()
+        assert 'shadowing_sql_query_duration_seconds_count{operation="SELECT"} 1' in rendered
+
+    def test_records_cache_hits_and_misses(self, client, sample_video):
+        with patch("routes.video.fetch_video_metadata") as mock_metadata, \
+                patch("routes.video.fetch_transcript"):
+            mock_metadata.side_effect = RuntimeError("should not be called")
+            client.post(
+                "/api/video",
+                json={"url": f"https://youtu.be/{sample_video.video_id}"},
+            )
+        lines = _metric_lines(client, "shadowing_cache_requests_total")
+        assert 'shadowing_cache_requests_total{cache="video_db",result="hit"} 1' in lines
+
+    def test_records_upstream_fetch_outcome(self):
+        from services import youtube_service
+
+        metrics.enabled = True
+        with patch("youtube_transcript_api.YouTubeTranscriptApi") as mock_api:
+            mock_api.return_value.list.side_effect = RuntimeError("boom")
+            with pytest.raises(RuntimeError):
+                youtube_service.fetch_transcript("dQw4w9WgXcQ")
+        rendered = metrics.render()
+        assert (
+            'shadowing_upstream_fetch_duration_seconds_count'
+            '{operation="transcript_list",outcome="error"} 1'
+        ) in rendered
+
+
+class TestMetricsDisabled:
+    """METRICS_ENABLED=False registers no hooks and no endpoint."""
+
+    def test_endpoint_not_registered(self):
+        app = create_app(testing=True, config={"METRICS_ENABLED": False})
+        client = app.test_client()
+        assert client.get("/api/metrics").status_code == 404
+
+    def test_nothing_recorded(self):
+        app = create_app(testing=True, config={"METRICS_ENABLED": False})
+        client = app.test_client()
+        client.get("/api/videos")
+        with app.app_context():
+            Progress.query.all()
+        assert "shadowing_request_duration_seconds_count" not in metrics.render()
+        assert "shadowing_sql_query_duration_seconds_count" not in metrics.render()
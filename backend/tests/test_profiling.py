@@ -0,0 +1,145 @@
+"""Tests for opt-in request profiling (X-Profile header)."""
+
+import cProfile
+import pstats
+import threading
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+import profiling
+from app import create_app
+from models import Progress, Transcript, Video
+
+
+@pytest.fixture()
+def profiled_app(tmp_path):
+    """An app with profiling enabled, writing profiles to a temp dir."""
+    app = create_app(testing=True, config={
+        "PROFILING_ENABLED": True,
+        "PROFILING_DIR": str(tmp_path),
+    })
+    with app.app_context():
+        from extensions import db
+
+        db.session.add(Video(
+            video_id="dQw4w9WgXcQ", title="Test", duration=60, transcript_json=[],
+        ))
+        db.session.add(Progress(video_id="dQw4w9WgXcQ", round=1, step=2))
+        db.session.commit()
+    return app
+
+
+class TestProfilingDisabled:
+    """Profiling is off by default; the header is ignored."""
+
+    def test_header_ignored(self, client, tmp_path):
+        resp = client.get("/api/videos", headers={"X-Profile": "1"})
+        assert resp.status_code == 200
+        assert "X-Profile-Id" not in resp.headers
+
+
+class TestProfilingEnabled:
+    """PROFILING_ENABLED=True profiles requests carrying X-Profile."""
+
+    def test_unprofiled_request_writes_nothing(self, profiled_app, tmp_path):
+        resp = profiled_app.test_client().get("/api/videos")
+        assert "X-Profile-Id" not in resp.headers
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cprofile_writes_pstats_dump(self, profiled_app, tmp_path):
+        resp = profiled_app.test_client().get(
+            "/api/progress/dQw4w9WgXcQ", headers={"X-Profile": "cprofile"}
+        )
+        assert resp.status_code == 200
+        profile_id = resp.headers["X-Profile-Id"]
+        assert profile_id.endswith("progress.get_progress")
+
+        stats = pstats.Stats(str(tmp_path / f"{profile_id}.prof"))
+        assert any(func[2] == "get_progress" for func in stats.stats)
+
+    def test_sample_mode_writes_folded_stacks(self, profiled_app, tmp_path):
+        resp = profiled_app.test_client().get(
+            "/api/videos", headers={"X-Profile": "sample"}
+        )
+        profile_id = resp.headers["X-Profile-Id"]
+        folded = (tmp_path / f"{profile_id}.folded").read_text()
+        for line in folded.splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) >= 1
+            assert stack
+
+    def test_sql_report_includes_query_plans(self, profiled_app, tmp_path):
+        resp = profiled_app.test_client().get(
+            "/api/progress/dQw4w9WgXcQ", headers={"X-Profile": "1"}
+        )
+        report = (tmp_path / f"{resp.headers['X-Profile-Id']}.sql.txt").read_text()
+        assert report.startswith("2 statements")
+        assert "FROM progress" in report
+        # SQLite plans for the progress lookup mention a SCAN or SEARCH step
+        assert "SCAN" in report or "SEARCH" in report
+
+    def test_concurrent_cprofile_request_is_sampled(self, profiled_app, tmp_path):
+        entered, release = threading.Event(), threading.Event()
+        first: dict = {}
+
+        def slow_entries(user_id):
+            entered.set()
+            release.wait(5)
+            return []
+
+        def profile_first():
+            first["resp"] = profiled_app.test_client().get(
+                "/api/videos", headers={"X-Profile": "cprofile"}
+            )
+
+        with patch("routes.video.library_entries", side_effect=slow_entries):
+            thread = threading.Thread(target=profile_first)
+            thread.start()
+            assert entered.wait(5)
+            try:
+                second = profiled_app.test_client().get(
+                    "/api/progress/dQw4w9WgXcQ", headers={"X-Profile": "cprofile"}
+                )
+            finally:
+                release.set()
+                thread.join()
+
+        assert second.status_code == 200
+        second_id = second.headers["X-Profile-Id"]
+        assert (tmp_path / f"{second_id}.folded").exists()
+        assert not (tmp_path / f"{second_id}.prof").exists()
+        assert first["resp"].status_code == 200
+        assert (tmp_path / f"{first['resp'].headers['X-Profile-Id']}.prof").exists()
+        assert not profiling._cprofile_lock.locked()
+
+    def test_outside_profiler_falls_back_to_sampling(self, profiled_app, tmp_path):
+        outside = cProfile.Profile()
+        outside.enable()
+        try:
+            resp = profiled_app.test_client().get(
+                "/api/videos", headers={"X-Profile": "cprofile"}
+            )
+        finally:
+            outside.disable()
+        assert resp.status_code == 200
+        assert (tmp_path / f"{resp.headers['X-Profile-Id']}.folded").exists()
+        assert not profiling._cprofile_lock.locked()
+
+    def test_failed_statement_leaves_no_timing_state(self, profiled_app):
+        from extensions import db
+
+        def fetch_while_another_request_stores(video_id, language):
+            with Session(db.engine) as other:
+                other.add(Transcript(video_id=video_id, language=language, segments_json=[]))
+                other.commit()
+            return []
+
+        with patch("routes.video.fetch_transcript", side_effect=fetch_while_another_request_stores):
+            resp = profiled_app.test_client().get(
+                "/api/video/dQw4w9WgXcQ/transcript?lang=fr", headers={"X-Profile": "1"}
+            )
+        assert resp.status_code == 200
+        with profiled_app.app_context(), db.engine.connect() as conn:
+            assert not any(key.startswith("_profile") for key in conn.info)
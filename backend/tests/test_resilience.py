@@ -0,0 +1,243 @@
+"""Tests for the upstream rate limiter and circuit breaker."""
+
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from services.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimitedError,
+    TokenBucket,
+    UpstreamGuard,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock; ``sleep`` advances it."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+class TestTokenBucket:
+    """TokenBucket — burst capacity and steady refill."""
+
+    def test_allows_burst_then_refuses(self, clock):
+        bucket = TokenBucket(rate=1, capacity=3, clock=clock, sleep=clock.sleep)
+        assert [bucket.acquire(max_wait=0) for _ in range(4)] == [True, True, True, False]
+
+    def test_waits_for_refill_within_max_wait(self, clock):
+        bucket = TokenBucket(rate=2, capacity=1, clock=clock, sleep=clock.sleep)
+        assert bucket.acquire(max_wait=0)
+        assert bucket.acquire(max_wait=1)
+        assert clock.now == pytest.approx(0.5)
+
+
+class TestCircuitBreaker:
+    """CircuitBreaker — open after N failures, half-open after the timeout."""
+
+    def test_opens_after_threshold(self, clock):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.before_call() > 0
+
+    def test_success_resets_failure_count(self, clock):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_half_open_allows_single_trial(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+        assert breaker.state == HALF_OPEN
+        assert breaker.before_call() == 0.0
+        # Second caller is rejected while the trial is in flight
+        assert breaker.before_call() > 0
+
+    def test_failed_trial_reopens(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+    def test_reports_state_changes(self, clock):
+        changes = []
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=5, clock=clock, on_state_change=changes.append
+        )
+        breaker.record_failure()
+        clock.now += 5
+        breaker.before_call()
+        breaker.record_success()
+        assert changes == [OPEN, HALF_OPEN, CLOSED]
+
+
+class _Interrupted(BaseException):
+    """Stands in for GreenletExit / gevent.Timeout unwinding a call."""
+
+
+class TestUpstreamGuard:
+    """UpstreamGuard.call — breaker bookkeeping for every way a call ends."""
+
+    def test_interrupted_trial_is_released(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        guard = UpstreamGuard(
+            "test", TokenBucket(100, 10, clock=clock, sleep=clock.sleep), breaker,
+            is_failure=lambda e: True,
+        )
+        breaker.record_failure()
+        clock.now += 10
+
+        def interrupted():
+            raise _Interrupted()
+
+        with pytest.raises(_Interrupted):
+            guard.call(interrupted)
+        # The next caller gets the half-open trial instead of CircuitOpenError
+        assert guard.call(lambda: "ok") == "ok"
+        assert breaker.state == CLOSED
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Responds with the server's configured status after its configured delay."""
+
+    def do_GET(self):
+        self.server.hits += 1
+        time.sleep(self.server.delay)
+        self.send_response(self.server.status)
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def stub_server():
+    """A local HTTP server whose status code and latency tests can change."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.status = 200
+    server.delay = 0.0
+    server.hits = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _is_failure(error: BaseException) -> bool:
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code == 429 or error.code >= 500
+    return isinstance(error, OSError)
+
+
+class TestUpstreamGuardAgainstStubServer:
+    """UpstreamGuard in front of a real HTTP server injecting 429s and latency."""
+
+    def _fetch(self, server) -> bytes:
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        with urllib.request.urlopen(url, timeout=0.2) as resp:
+            return resp.read()
+
+    def _guard(self, **kwargs) -> UpstreamGuard:
+        defaults = {
+            "limiter": TokenBucket(rate=1000, capacity=1000),
+            "breaker": CircuitBreaker(failure_threshold=3, reset_timeout=0.2),
+            "is_failure": _is_failure,
+        }
+        defaults.update(kwargs)
+        return UpstreamGuard("stub", **defaults)
+
+    def test_429s_open_circuit_and_fail_fast(self, stub_server):
+        stub_server.status = 429
+        guard = self._guard()
+        for _ in range(3):
+            with pytest.raises(urllib.error.HTTPError):
+                guard.call(self._fetch, stub_server)
+        assert guard.breaker.state == OPEN
+
+        with pytest.raises(CircuitOpenError) as exc:
+            guard.call(self._fetch, stub_server)
+        assert exc.value.error_code == "UPSTREAM_CIRCUIT_OPEN"
+        assert stub_server.hits == 3
+
+    def test_timeouts_count_as_failures(self, stub_server):
+        stub_server.delay = 0.5
+        guard = self._guard()
+        for _ in range(3):
+            with pytest.raises(OSError):
+                guard.call(self._fetch, stub_server)
+        assert guard.breaker.state == OPEN
+
+    def test_half_open_trial_recovers(self, stub_server):
+        stub_server.status = 503
+        guard = self._guard()
+        for _ in range(3):
+            with pytest.raises(urllib.error.HTTPError):
+                guard.call(self._fetch, stub_server)
+
+        stub_server.status = 200
+        time.sleep(0.25)
+        assert guard.breaker.state == HALF_OPEN
+        assert guard.call(self._fetch, stub_server) == b"ok"
+        assert guard.breaker.state == CLOSED
+
+    def test_rate_limit_fails_fast(self, stub_server):
+        guard = self._guard(limiter=TokenBucket(rate=0.01, capacity=1), max_wait=0)
+        assert guard.call(self._fetch, stub_server) == b"ok"
+        with pytest.raises(RateLimitedError) as exc:
+            guard.call(self._fetch, stub_server)
+        assert exc.value.error_code == "UPSTREAM_RATE_LIMITED"
+        assert stub_server.hits == 1
+
+
+class TestPostVideoThrottled:
+    """POST /api/video — fail-fast rejections map to 503/429 with Retry-After."""
+
+    @patch("routes.video.fetch_video_metadata")
+    def test_circuit_open_returns_503(self, mock_metadata, client):
+        mock_metadata.side_effect = CircuitOpenError("metadata", retry_after=12)
+        resp = client.post("/api/video", json={"url": "https://youtu.be/dQw4w9WgXcQ"})
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"] == "12"
+        assert resp.get_json()["error_code"] == "UPSTREAM_CIRCUIT_OPEN"
+
+    @patch("routes.video.fetch_video_metadata")
+    def test_rate_limited_returns_429(self, mock_metadata, client):
+        mock_metadata.side_effect = RateLimitedError("metadata", retry_after=1)
+        resp = client.post("/api/video", json={"url": "https://youtu.be/dQw4w9WgXcQ"})
+        assert resp.status_code == 429
+        assert resp.get_json()["error_code"] == "UPSTREAM_RATE_LIMITED"
+
+    def test_circuit_state_exported(self, client):
+        body = client.get("/api/metrics").get_data(as_text=True)
+        assert 'shadowing_upstream_circuit_state{operation="metadata"} 0' in body
@@ -0,0 +1,175 @@
+"""Tests for the change log and the delta sync endpoint."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from sqlalchemy.orm import Session
+
+from models import ChangeLog
+from services import changelog
+from services.changelog import changes_page, compact_changelog, start_compaction
+
+METADATA = {"title": "Test Video", "duration": 120, "thumbnail": "https://img.youtube.com/t.jpg"}
+TRANSCRIPT = [{"start": 0.0, "duration": 2.0, "text": "Hello world."}]
+
+
+def _add_video(client, video_id: str = "dQw4w9WgXcQ"):
+    with patch("routes.video.fetch_video_metadata", return_value=METADATA), \
+            patch("routes.video.fetch_transcript", return_value=TRANSCRIPT):
+        return client.post("/api/video", json={"url": f"https://youtu.be/{video_id}"})
+
+
+def _add_progress(client, video_id: str = "dQw4w9WgXcQ", round_: int = 1):
+    return client.post("/api/progress", json={"video_id": video_id, "round": round_, "step": 1})
+
+
+class TestGetSync:
+    """GET /api/sync — ordered inserts/deletes since a sequence number."""
+
+    def test_empty_log(self, client, db):
+        resp = client.get("/api/sync")
+        assert resp.status_code == 200
+        assert resp.get_json() == {
+            "changes": [], "latest_seq": 0, "has_more": False, "reset": False,
+        }
+
+    def test_records_video_and_progress_inserts(self, client, db):
+        _add_video(client)
+        progress = _add_progress(client).get_json()
+
+        data = client.get("/api/sync?since=0").get_json()
+        assert [(c["entity"], c["op"]) for c in data["changes"]] == [
+            ("video", "insert"), ("progress", "insert"),
+        ]
+        video_change, progress_change = data["changes"]
+        assert video_change["data"]["title"] == "Test Video"
+        assert video_change["data"]["current_round"] == 0
+        assert progress_change["id"] == str(progress["id"])
+        assert progress_change["data"] == progress
+        assert data["latest_seq"] == progress_change["seq"]
+
+    def test_since_returns_only_newer_changes(self, client, db):
+        _add_video(client)
+        seq = client.get("/api/sync").get_json()["latest_seq"]
+        _add_progress(client)
+
+        data = client.get(f"/api/sync?since={seq}").get_json()
+        assert [c["entity"] for c in data["changes"]] == ["progress"]
+        assert client.get(f"/api/sync?since={data['latest_seq']}").get_json()["changes"] == []
+
+    def test_records_single_and_bulk_deletes(self, client, db):
+        for video_id in ("aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"):
+            _add_video(client, video_id)
+        seq = client.get("/api/sync").get_json()["latest_seq"]
+
+        client.delete("/api/video/aaaaaaaaaaa")
+        client.delete("/api/videos", json={"video_ids": ["bbbbbbbbbbb", "zzzzzzzzzzz"]})
+        client.delete("/api/video/zzzzzzzzzzz")
+
+        changes = client.get(f"/api/sync?since={seq}").get_json()["changes"]
+        assert [(c["op"], c["id"]) for c in changes] == [
+            ("delete", "aaaaaaaaaaa"), ("delete", "bbbbbbbbbbb"),
+        ]
+
+    def test_change_committed_during_read_is_not_skipped(self, client, db):
+        _add_video(client)
+
+        def read_then_commit_another(*args):
+            changes = changes_page(*args)
+            with Session(db.engine) as other:
+                other.add(ChangeLog(
+                    entity="progress", op="insert", entity_id="1", video_id="dQw4w9WgXcQ"
+                ))
+                other.commit()
+            return changes
+
+        with patch("routes.sync.changes_page", side_effect=read_then_commit_another):
+            first = client.get("/api/sync").get_json()
+        assert [c["entity"] for c in first["changes"]] == ["video"]
+
+        second = client.get(f"/api/sync?since={first['latest_seq']}").get_json()
+        assert [c["entity"] for c in second["changes"]] == ["progress"]
+
+    def test_pagination(self, client, db):
+        for round_ in range(1, 6):
+            if round_ == 1:
+                _add_video(client)
+            _add_progress(client, round_=round_)
+
+        seen = []
+        since = 0
+        while True:
+            data = client.get(f"/api/sync?since={since}&limit=2").get_json()
+            seen.extend(c["seq"] for c in data["changes"])
+            since = data["latest_seq"]
+            if not data["has_more"]:
+                break
+        assert len(seen) == 6
+        assert seen == sorted(seen)
+
+    def test_invalid_params(self, client, db):
+        assert client.get("/api/sync?since=abc").status_code == 400
+        assert client.get("/api/sync?since=-1").status_code == 400
+        assert client.get("/api/sync?limit=0").status_code == 400
+        assert client.get("/api/sync?limit=5000").status_code == 400
+
+
+class TestCompaction:
+    """compact_changelog — superseded inserts and expired entries."""
+
+    def test_drops_inserts_superseded_by_delete(self, client, db):
+        _add_video(client, "aaaaaaaaaaa")
+        _add_progress(client, "aaaaaaaaaaa")
+        _add_video(client, "bbbbbbbbbbb")
+        client.delete("/api/video/aaaaaaaaaaa")
+
+        assert compact_changelog() == 2
+        db.session.commit()
+        changes = client.get("/api/sync").get_json()["changes"]
+        assert [(c["op"], c["id"]) for c in changes] == [
+            ("insert", "bbbbbbbbbbb"), ("delete", "aaaaaaaaaaa"),
+        ]
+
+    def test_keeps_reinsert_after_delete(self, client, db):
+        _add_video(client)
+        client.delete("/api/video/dQw4w9WgXcQ")
+        _add_video(client)
+        compact_changelog()
+        db.session.commit()
+
+        changes = client.get("/api/sync").get_json()["changes"]
+        assert [c["op"] for c in changes] == ["delete", "insert"]
+
+    def test_truncation_forces_reset_for_stale_clients(self, client, db):
+        _add_video(client)
+        old_seq = client.get("/api/sync").get_json()["latest_seq"]
+        _add_progress(client)
+
+        later = datetime.now(timezone.utc) + changelog.RETENTION + timedelta(seconds=1)
+        compact_changelog(now=later)
+        db.session.commit()
+        assert db.session.query(ChangeLog).count() == 0
+
+        stale = client.get(f"/api/sync?since={old_seq}").get_json()
+        assert stale["reset"] is True
+        assert stale["latest_seq"] == old_seq + 1
+        fresh = client.get(f"/api/sync?since={stale['latest_seq']}").get_json()
+        assert fresh["reset"] is False
+
+    def test_compacts_in_background_after_commit(self, client, db, monkeypatch):
+        monkeypatch.setattr(changelog, "COMPACT_EVERY", 3)
+        scheduled = []
+        monkeypatch.setattr(changelog, "start_compaction", scheduled.append)
+        _add_video(client)
+        client.delete("/api/video/dQw4w9WgXcQ")
+        assert scheduled == []
+        _add_video(client)  # seq 3 schedules compaction
+
+        # The triggering request itself leaves the log untouched
+        changes = client.get("/api/sync").get_json()["changes"]
+        assert [c["seq"] for c in changes] == [1, 2, 3]
+
+        assert len(scheduled) == 1
+        start_compaction(scheduled[0]).join(5)
+        changes = client.get("/api/sync").get_json()["changes"]
+        assert [c["seq"] for c in changes] == [2, 3]
@@ -0,0 +1,88 @@
+"""Tests for sentence re-segmentation and practice chunking."""
+
+from services.transcript_processing import (
+    MAX_SENTENCE_SECONDS,
+    build_chunks,
+    process_transcript,
+    segment_sentences,
+)
+
+
+def _frag(start: float, duration: float, text: str) -> dict:
+    return {"start": start, "duration": duration, "text": text}
+
+
+class TestSegmentSentences:
+    """segment_sentences() — merge caption fragments into sentences."""
+
+    def test_empty(self):
+        assert segment_sentences([]) == []
+
+    def test_merges_until_terminal_punctuation(self):
+        sentences = segment_sentences([
+            _frag(0.0, 1.0, "so today we"),
+            _frag(1.0, 1.0, "talk about shadowing."),
+            _frag(2.0, 1.0, "Ready?"),
+        ])
+        assert [s["text"] for s in sentences] == [
+            "so today we talk about shadowing.",
+            "Ready?",
+        ]
+        assert sentences[0]["first_segment"] == 0
+        assert sentences[0]["last_segment"] == 1
+        assert sentences[1]["start"] == 2.0
+
+    def test_clips_overlapping_fragments(self):
+        sentences = segment_sentences([
+            _frag(0.0, 4.0, "hello there."),
+            _frag(1.5, 4.0, "general kenobi."),
+        ])
+        assert sentences[0]["duration"] == 1.5
+        assert sentences[1]["duration"] == 4.0
+
+    def test_long_pause_ends_sentence(self):
+        sentences = segment_sentences([
+            _frag(0.0, 1.0, "no punctuation here"),
+            _frag(5.0, 1.0, "after a pause"),
+        ])
+        assert len(sentences) == 2
+
+    def test_unpunctuated_captions_are_capped(self):
+        fragments = [_frag(i * 2.0, 2.0, f"word{i}") for i in range(30)]
+        sentences = segment_sentences(fragments)
+        assert len(sentences) > 1
+        assert all(s["duration"] <= MAX_SENTENCE_SECONDS for s in sentences)
+        # Every fragment lands in exactly one sentence
+        covered = [i for s in sentences for i in range(s["first_segment"], s["last_segment"] + 1)]
+        assert covered == list(range(30))
+
+    def test_normalizes_whitespace_and_skips_empty_text(self):
+        sentences = segment_sentences([
+            _frag(0.0, 1.0, "line one\nline  two."),
+            _frag(1.0, 1.0, "   "),
+        ])
+        assert [s["text"] for s in sentences] == ["line one line two."]
+
+
+class TestBuildChunks:
+    """build_chunks() — group sentences into loop ranges."""
+
+    def test_groups_up_to_target(self):
+        sentences = [
+            {"start": 0.0, "duration": 8.0},
+            {"start": 8.0, "duration": 8.0},
+            {"start": 16.0, "duration": 8.0},
+        ]
+        assert build_chunks(sentences, target_seconds=20) == [
+            {"start": 0.0, "end": 16.0, "first_sentence": 0, "last_sentence": 1},
+            {"start": 16.0, "end": 24.0, "first_sentence": 2, "last_sentence": 2},
+        ]
+
+    def test_long_sentence_is_own_chunk(self):
+        chunks = build_chunks([{"start": 0.0, "duration": 30.0}], target_seconds=20)
+        assert chunks == [{"start": 0.0, "end": 30.0, "first_sentence": 0, "last_sentence": 0}]
+
+    def test_process_transcript(self):
+        result = process_transcript([_frag(0.0, 1.0, "Hi."), _frag(1.0, 1.0, "Bye.")])
+        assert len(result["sentences"]) == 2
+        assert result["chunks"][0]["last_sentence"] == 1
@@ -0,0 +1,238 @@
+"""Tests for users, bearer-token auth and per-user partitioning."""
+
+import itertools
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from models import Progress, UserVideo, Video
+from services.changelog import RETENTION, compact_changelog
+from services.importer import ImportJob, run_import
+
+METADATA = {"title": "Test Video", "duration": 120, "thumbnail": "https://img.youtube.com/t.jpg"}
+TRANSCRIPT = [{"start": 0.0, "duration": 2.0, "text": "Hello world."}]
+
+
+def _auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture()
+def alice(client, db) -> dict:
+    return _auth(client.post("/api/users", json={"name": "Alice"}).get_json()["token"])
+
+
+@pytest.fixture()
+def bob(client, db) -> dict:
+    return _auth(client.post("/api/users", json={"name": "Bob"}).get_json()["token"])
+
+
+def _add_video(client, headers=None, video_id="dQw4w9WgXcQ"):
+    with patch("routes.video.fetch_video_metadata", return_value=METADATA) as mock_metadata, \
+            patch("routes.video.fetch_transcript", return_value=TRANSCRIPT):
+        resp = client.post(
+            "/api/video", json={"url": f"https://youtu.be/{video_id}"}, headers=headers
+        )
+    assert resp.status_code == 200
+    return mock_metadata
+
+
+def _log_round(client, headers=None, round_=1, video_id="dQw4w9WgXcQ"):
+    resp = client.post(
+        "/api/progress", json={"video_id": video_id, "round": round_, "step": 1}, headers=headers
+    )
+    assert resp.status_code == 201
+    return resp.get_json()
+
+
+class TestUsers:
+    """POST /api/users, GET /api/users/me and token validation."""
+
+    def test_create_user_returns_token_once(self, client, db):
+        resp = client.post("/api/users", json={"name": "  Alice "})
+        assert resp.status_code == 201
+        data = resp.get_json()
+        assert data["name"] == "Alice"
+        me = client.get("/api/users/me", headers=_auth(data["token"])).get_json()
+        assert me == {"id": data["id"], "name": "Alice", "created_at": data["created_at"]}
+
+    def test_create_user_validation(self, client, db):
+        assert client.post("/api/users", json={}).status_code == 400
+        assert client.post("/api/users", json={"name": " "}).status_code == 400
+        assert client.post("/api/users", json={"name": "x" * 101}).status_code == 400
+
+    def test_me_requires_token(self, client, db):
+        assert client.get("/api/users/me").status_code == 401
+
+    def test_invalid_token_rejected_everywhere(self, client, db):
+        for headers in (_auth("wrong"), {"Authorization": "Basic dXNlcjpwdw=="}):
+            resp = client.get("/api/videos", headers=headers)
+            assert resp.status_code == 401
+            assert resp.get_json()["error_code"] == "INVALID_TOKEN"
+
+
+class TestPerUserLibrary:
+    """Shared videos, per-user libraries and progress."""
+
+    def test_videos_are_shared_and_fetched_once(self, client, alice, bob):
+        assert _add_video(client, alice).call_count == 1
+        assert _add_video(client, bob).call_count == 0
+        assert Video.query.count() == 1
+        assert UserVideo.query.count() == 2
+
+    def test_library_is_per_user(self, client, alice, bob):
+        _add_video(client, alice)
+        assert [v["video_id"] for v in client.get("/api/videos", headers=alice).get_json()] == [
+            "dQw4w9WgXcQ"
+        ]
+        assert client.get("/api/videos", headers=bob).get_json() == []
+        # Anonymous requests keep seeing every stored video
+        assert len(client.get("/api/videos").get_json()) == 1
+
+    def test_progress_is_partitioned(self, client, alice, bob):
+        _add_video(client)
+        _log_round(client, alice, round_=3)
+        _log_round(client, bob, round_=1)
+        _log_round(client, None, round_=2)
+
+        assert client.get("/api/progress/dQw4w9WgXcQ", headers=alice).get_json()[
+            "current_round"] == 3
+        assert client.get("/api/progress/dQw4w9WgXcQ", headers=bob).get_json()[
+            "current_round"] == 1
+        assert client.get("/api/progress/dQw4w9WgXcQ").get_json()["current_round"] == 2
+        # Logging progress adds the video to the learner's library
+        library = client.get("/api/videos", headers=bob).get_json()
+        assert library[0]["current_round"] == 1
+
+    def test_list_videos_is_one_query(self, client, db, alice):
+        for i in range(5):
+            _add_video(client, alice, video_id=f"vid{i:08d}")
+            _log_round(client, alice, video_id=f"vid{i:08d}", round_=i + 1)
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            library = client.get("/api/videos", headers=alice).get_json()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+
+        # One token lookup plus one library query
+        assert len(statements) == 2
+        assert [v["current_round"] for v in library] == [5, 4, 3, 2, 1]
+
+    def test_user_delete_only_leaves_library(self, client, alice, bob):
+        _add_video(client, alice)
+        _add_video(client, bob)
+        _log_round(client, alice)
+        _log_round(client, bob)
+
+        assert client.delete("/api/video/dQw4w9WgXcQ", headers=alice).status_code == 200
+        assert client.delete("/api/video/dQw4w9WgXcQ", headers=alice).status_code == 404
+        assert client.get("/api/videos", headers=alice).get_json() == []
+        assert len(client.get("/api/videos", headers=bob).get_json()) == 1
+        assert Progress.query.count() == 1
+
+    def test_user_bulk_delete(self, client, alice):
+        _add_video(client, alice)
+        resp = client.delete(
+            "/api/videos", json={"video_ids": ["dQw4w9WgXcQ", "zzzzzzzzzzz"]}, headers=alice
+        )
+        assert resp.get_json() == {"deleted": 1, "not_found": ["zzzzzzzzzzz"], "in_use": []}
+        assert Video.query.count() == 1
+
+
+class TestPerUserSync:
+    """GET /api/sync and /api/events scoped to the authenticated user."""
+
+    def test_sync_is_scoped(self, client, alice, bob):
+        _add_video(client, alice)
+        _log_round(client, alice)
+        _log_round(client, bob)
+
+        alice_changes = client.get("/api/sync", headers=alice).get_json()["changes"]
+        assert [(c["entity"], c["op"]) for c in alice_changes] == [
+            ("video", "insert"), ("progress", "insert"),
+        ]
+        # The global view sees the video but no authenticated progress
+        global_changes = client.get("/api/sync").get_json()["changes"]
+        assert [c["entity"] for c in global_changes] == ["video"]
+
+    def test_global_delete_keeps_users_videos(self, client, alice):
+        _add_video(client, alice)
+        _log_round(client, alice)
+        _log_round(client)
+        seq = client.get("/api/sync", headers=alice).get_json()["latest_seq"]
+
+        resp = client.delete("/api/video/dQw4w9WgXcQ")
+        assert resp.status_code == 409
+        assert resp.get_json()["error_code"] == "VIDEO_IN_USE"
+        assert client.get(f"/api/sync?since={seq}", headers=alice).get_json()["changes"] == []
+        assert len(client.get("/api/videos", headers=alice).get_json()) == 1
+        assert client.get("/api/progress/dQw4w9WgXcQ", headers=alice).status_code == 200
+        assert Progress.query.count() == 2
+
+    def test_global_bulk_delete_skips_users_videos(self, client, alice):
+        _add_video(client, alice)
+        _add_video(client, video_id="aaaaaaaaaaa")
+        _log_round(client, video_id="aaaaaaaaaaa")
+
+        resp = client.delete("/api/videos", json={"video_ids": ["dQw4w9WgXcQ", "aaaaaaaaaaa"]})
+        assert resp.get_json() == {"deleted": 1, "not_found": [], "in_use": ["dQw4w9WgXcQ"]}
+        assert [v.video_id for v in Video.query] == ["dQw4w9WgXcQ"]
+        assert Progress.query.count() == 0
+
+    def test_events_are_scoped(self, client, alice, bob):
+        _add_video(client)
+        resp = client.get("/api/events", headers=alice)
+        stream = iter(resp.response)
+        next(stream)
+
+        _log_round(client, bob)
+        _log_round(client, alice, round_=7)
+        events = list(itertools.islice(stream, 2))
+        # Bob's round is not delivered; Alice's adds the video to her library first
+        assert [e.split(b"\n")[1] for e in events] == [
+            b"event: video-created", b"event: progress-created",
+        ]
+        assert b'"round":7' in events[1]
+        resp.close()
+
+
+    def test_idle_user_keeps_pace_with_log(self, client, db, alice):
+        _add_video(client, alice)
+        seq = client.get("/api/sync", headers=alice).get_json()["latest_seq"]
+        _add_video(client, video_id="aaaaaaaaaaa")
+        _log_round(client, video_id="aaaaaaaaaaa")
+
+        idle = client.get(f"/api/sync?since={seq}", headers=alice).get_json()
+        assert idle["changes"] == []
+        assert idle["latest_seq"] == seq + 2
+
+        # Truncating everything others logged doesn't force alice to re-fetch
+        compact_changelog(now=datetime.now(timezone.utc) + RETENTION + timedelta(seconds=1))
+        db.session.commit()
+        after = client.get(f"/api/sync?since={idle['latest_seq']}", headers=alice).get_json()
+        assert after["reset"] is False
+
+
+class TestPerUserImport:
+    """Imports add stored videos to the importing user's library."""
+
+    @patch("services.importer.fetch_transcript", return_value=TRANSCRIPT)
+    def test_existing_videos_join_library(self, mock_transcript, client, db, alice):
+        _add_video(client)
+        user_id = client.get("/api/users/me", headers=alice).get_json()["id"]
+        entries = [
+            {"video_id": "dQw4w9WgXcQ", "title": "T", "duration": 1, "thumbnail": ""},
+            {"video_id": "vid00000001", "title": "New", "duration": 1, "thumbnail": ""},
+        ]
+        job = ImportJob(id="j", url="https://www.youtube.com/@chan/videos", user_id=user_id)
+        with patch("services.importer.iter_collection_entries", return_value=iter(entries)):
+            run_import(job)
+
+        assert (job.imported, job.skipped) == (1, 1)
+        library = client.get("/api/videos", headers=alice).get_json()
+        assert {v["video_id"] for v in library} == {"dQw4w9WgXcQ", "vid00000001"}
@@ -3,9 +3,13 @@
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy.orm import Session
 from yt_dlp.utils import DownloadError
 from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled
 
+from models import Transcript, TranscriptSegmentation
+from services.youtube_service import TranscriptUnavailableError, VideoUnavailableError
+
 
 @pytest.fixture()
 def mock_video_data() -> dict:
@@ -163,3 +167,175 @@ class TestGetTranscript:
         data = resp.get_json()
         assert data["video_id"] == "dQw4w9WgXcQ"
         assert len(data["transcript"]) == 1
+
+
+class TestPostVideoCachedFailures:
+    """POST /api/video — negative fetch-cache hits map to the usual errors."""
+
+    @patch("routes.video.fetch_video_metadata")
+    @patch("routes.video.fetch_transcript")
+    def test_cached_missing_transcript_returns_422(
+        self, mock_transcript, mock_metadata, client, mock_video_data
+    ):
+        mock_metadata.return_value = mock_video_data["metadata"]
+        mock_transcript.side_effect = TranscriptUnavailableError("NoTranscriptFound")
+        resp = client.post(
+            "/api/video",
+            json={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"},
+        )
+        assert resp.status_code == 422
+        assert resp.get_json()["error_code"] == "TRANSCRIPT_UNAVAILABLE"
+
+    @patch("routes.video.fetch_video_metadata")
+    @patch("routes.video.fetch_transcript")
+    def test_cached_unavailable_video_returns_502(
+        self, mock_transcript, mock_metadata, client
+    ):
+        mock_metadata.side_effect = VideoUnavailableError("Video unavailable")
+        resp = client.post(
+            "/api/video",
+            json={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"},
+        )
+        assert resp.status_code == 502
+        assert resp.get_json()["error_code"] == "VIDEO_UNAVAILABLE"
+
+
+class TestGetTranscriptLanguage:
+    """GET /api/video/<id>/transcript?lang= — per-language transcripts."""
+
+    def test_default_language_is_primary_transcript(self, client, sample_video):
+        resp = client.get(f"/api/video/{sample_video.video_id}/transcript?lang=en")
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data["language"] == "en"
+        assert data["transcript"] == sample_video.transcript_json
+
+    def test_invalid_language(self, client, sample_video):
+        resp = client.get(f"/api/video/{sample_video.video_id}/transcript?lang=../x")
+        assert resp.status_code == 400
+
+    @patch("routes.video.fetch_transcript")
+    def test_fetches_once_then_serves_from_db(self, mock_transcript, client, sample_video):
+        mock_transcript.return_value = [{"start": 0.0, "duration": 2.5, "text": "Bonjour"}]
+
+        for _ in range(2):
+            resp = client.get(f"/api/video/{sample_video.video_id}/transcript?lang=fr")
+            assert resp.status_code == 200
+            assert resp.get_json()["transcript"][0]["text"] == "Bonjour"
+        mock_transcript.assert_called_once_with(sample_video.video_id, "fr")
+
+    @patch("routes.video.fetch_transcript")
+    def test_concurrent_first_fetch_serves_stored_row(
+        self, mock_transcript, client, db, sample_video
+    ):
+        def fetch_while_another_request_stores(video_id, language):
+            with Session(db.engine) as other:
+                other.add(Transcript(
+                    video_id=video_id,
+                    language=language,
+                    segments_json=[{"start": 0.0, "duration": 1.0, "text": "Salut"}],
+                ))
+                other.commit()
+            return [{"start": 0.0, "duration": 2.5, "text": "Bonjour"}]
+
+        mock_transcript.side_effect = fetch_while_another_request_stores
+        resp = client.get(f"/api/video/{sample_video.video_id}/transcript?lang=fr")
+        assert resp.status_code == 200
+        assert resp.get_json()["transcript"][0]["text"] == "Salut"
+        assert db.session.query(Transcript).count() == 1
+
+    @patch("routes.video.fetch_transcript")
+    def test_unavailable_language_returns_422(self, mock_transcript, client, sample_video):
+        mock_transcript.side_effect = NoTranscriptFound(sample_video.video_id, ["ja"], None)
+        resp = client.get(f"/api/video/{sample_video.video_id}/transcript?lang=ja")
+        assert resp.status_code == 422
+        assert resp.get_json()["error_code"] == "TRANSCRIPT_UNAVAILABLE"
+
+    @patch("routes.video.fetch_transcript")
+    def test_deleting_video_removes_translations(
+        self, mock_transcript, client, db, sample_video
+    ):
+        mock_transcript.return_value = [{"start": 0.0, "duration": 1.0, "text": "Hola"}]
+        client.get(f"/api/video/{sample_video.video_id}/transcript?lang=es")
+        client.delete(f"/api/video/{sample_video.video_id}")
+        assert db.session.query(Transcript).count() == 0
+
+    @patch("routes.video.list_transcript_languages")
+    @patch("routes.video.fetch_transcript")
+    def test_lists_languages(self, mock_transcript, mock_languages, client, sample_video):
+        mock_transcript.return_value = [{"start": 0.0, "duration": 1.0, "text": "Hola"}]
+        mock_languages.return_value = {"tracks": [], "translation_languages": []}
+        client.get(f"/api/video/{sample_video.video_id}/transcript?lang=es")
+
+        resp = client.get(f"/api/video/{sample_video.video_id}/transcript/languages")
+        assert resp.status_code == 200
+        assert resp.get_json()["stored"] == ["en", "es"]
+
+
+class TestGetTranscriptSentences:
+    """GET /api/video/<id>/transcript?granularity=sentence — precomputed units."""
+
+    @patch("routes.video.fetch_video_metadata")
+    @patch("routes.video.fetch_transcript")
+    def test_create_video_stores_segmentation(
+        self, mock_transcript, mock_metadata, client, db, mock_video_data
+    ):
+        mock_metadata.return_value = mock_video_data["metadata"]
+        mock_transcript.return_value = [
+            {"start": 0.0, "duration": 1.0, "text": "Hello"},
+            {"start": 1.0, "duration": 1.5, "text": "world."},
+        ]
+        client.post("/api/video", json={"url": "https://youtu.be/dQw4w9WgXcQ"})
+        assert db.session.get(TranscriptSegmentation, ("dQw4w9WgXcQ", "en")) is not None
+
+        resp = client.get("/api/video/dQw4w9WgXcQ/transcript?granularity=sentence")
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data["granularity"] == "sentence"
+        assert data["transcript"] == [{
+            "start": 0.0, "duration": 2.5, "text": "Hello world.",
+            "first_segment": 0, "last_segment": 1,
+        }]
+        assert data["chunks"] == [
+            {"start": 0.0, "end": 2.5, "first_sentence": 0, "last_sentence": 0}
+        ]
+
+    def test_computed_lazily_for_existing_videos(self, client, db, sample_video):
+        resp = client.get(f"/api/video/{sample_video.video_id}/transcript?granularity=sentence")
+        assert resp.status_code == 200
+        assert resp.get_json()["transcript"][0]["text"] == "Hello world"
+        assert db.session.query(TranscriptSegmentation).count() == 1
+
+    def test_concurrent_first_request_serves_stored_row(self, client, db, sample_video):
+        from services.transcript_processing import process_transcript
+
+        def process_while_another_request_stores(segments):
+            processed = process_transcript(segments)
+            with Session(db.engine) as other:
+                other.add(TranscriptSegmentation(
+                    video_id=sample_video.video_id,
+                    language="en",
+                    sentences_json=processed["sentences"],
+                    chunks_json=processed["chunks"],
+                ))
+                other.commit()
+            return processed
+
+        with patch(
+            "routes.video.process_transcript", side_effect=process_while_another_request_stores
+        ):
+            resp = client.get(
+                f"/api/video/{sample_video.video_id}/transcript?granularity=sentence"
+            )
+        assert resp.status_code == 200
+        assert resp.get_json()["transcript"][0]["text"] == "Hello world"
+        assert db.session.query(TranscriptSegmentation).count() == 1
+
+    def test_invalid_granularity(self, client, sample_video):
+        resp = client.get(f"/api/video/{sample_video.video_id}/transcript?granularity=word")
+        assert resp.status_code == 400
+
+    def test_deleting_video_removes_segmentation(self, client, db, sample_video):
+        client.get(f"/api/video/{sample_video.video_id}/transcript?granularity=sentence")
+        client.delete(f"/api/video/{sample_video.video_id}")
+        assert db.session.query(TranscriptSegmentation).count() == 0
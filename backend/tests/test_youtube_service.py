@@ -1,6 +1,26 @@
 """Tests for the youtube_service helper functions."""
 
-from services.youtube_service import extract_video_id
+from unittest.mock import call, patch
+
+import pytest
+from yt_dlp.utils import DownloadError
+from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled
+
+from services.resilience import CircuitOpenError
+from services.youtube_service import (
+    PAGE_THROTTLE_RETRIES,
+    TranscriptUnavailableError,
+    VideoUnavailableError,
+    _transcript_lists,
+    extract_collection_url,
+    extract_video_id,
+    fetch_cache,
+    fetch_transcript,
+    fetch_video_metadata,
+    guards,
+    iter_collection_entries,
+    list_transcript_languages,
+)
 
 
 class TestExtractVideoId:
@@ -30,3 +50,215 @@ class TestExtractVideoId:
 
     def test_random_text(self):
         assert extract_video_id("not a url at all") is None
+
+
+class TestExtractCollectionUrl:
+    """extract_collection_url() — normalize playlist and channel URLs."""
+
+    def test_playlist(self):
+        url = "youtube.com/playlist?si=x&list=PLabc_123-x"
+        assert extract_collection_url(url) == "https://www.youtube.com/playlist?list=PLabc_123-x"
+
+    def test_channel_defaults_to_videos_tab(self):
+        assert extract_collection_url("https://www.youtube.com/@Some.Chan") == (
+            "https://www.youtube.com/@Some.Chan/videos"
+        )
+
+    def test_channel_tab_is_kept(self):
+        url = "https://m.youtube.com/channel/UCabcdefghijklmnopqrstuv/shorts?view=0"
+        assert extract_collection_url(url) == (
+            "https://www.youtube.com/channel/UCabcdefghijklmnopqrstuv/shorts"
+        )
+
+    def test_single_video_is_not_a_collection(self):
+        assert extract_collection_url("https://youtu.be/dQw4w9WgXcQ") is None
+        assert extract_collection_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLx") is None
+
+
+class TestIterCollectionEntries:
+    """iter_collection_entries() — lazy flat enumeration via yt-dlp."""
+
+    def test_yields_entries_lazily(self):
+        consumed = []
+
+        def entries():
+            for i in range(3):
+                consumed.append(i)
+                yield {"id": f"video{i:06d}", "title": f"T{i}", "duration": 61.0,
+                       "thumbnails": [{"url": "small"}, {"url": f"big{i}"}]}
+
+        with patch("yt_dlp.YoutubeDL") as mock_ydl:
+            ydl = mock_ydl.return_value.__enter__.return_value
+            ydl.extract_info.return_value = {"_type": "playlist", "entries": entries()}
+            stream = iter_collection_entries("https://www.youtube.com/@chan/videos")
+            first = next(stream)
+
+        assert consumed == [0]
+        assert first == {"video_id": "video000000", "title": "T0", "duration": 61,
+                         "thumbnail": "big0"}
+        assert ydl.extract_info.call_args.kwargs == {"download": False, "process": False}
+        assert mock_ydl.call_args.args[0]["extract_flat"] == "in_playlist"
+
+    def test_skips_nested_and_unavailable_entries(self):
+        with patch("yt_dlp.YoutubeDL") as mock_ydl:
+            ydl = mock_ydl.return_value.__enter__.return_value
+            ydl.extract_info.return_value = {"entries": iter([
+                None,
+                {"id": "UUabcdefghijklmnopqrstuv", "_type": "url"},
+                {"id": "dQw4w9WgXcQ"},
+            ])}
+            entries = list(iter_collection_entries("https://www.youtube.com/@chan/videos"))
+        assert entries == [
+            {"video_id": "dQw4w9WgXcQ", "title": None, "duration": None, "thumbnail": None}
+        ]
+
+    def test_every_page_request_is_guarded(self):
+        def entries():
+            for page in range(2):
+                ydl.urlopen(f"page{page}")  # yt-dlp fetches continuations lazily
+                yield {"id": f"video{page:06d}"}
+
+        with patch("yt_dlp.YoutubeDL") as mock_ydl:
+            ydl = mock_ydl.return_value.__enter__.return_value
+            raw_urlopen = ydl.urlopen
+            ydl.extract_info.return_value = {"entries": entries()}
+            stream = iter_collection_entries("https://www.youtube.com/@chan/videos")
+            next(stream)
+
+            breaker = guards["metadata"].breaker
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure()
+            with patch("services.youtube_service.time.sleep") as mock_sleep, \
+                    pytest.raises(CircuitOpenError):
+                next(stream)
+
+        assert raw_urlopen.call_args_list == [call("page0")]
+        assert mock_sleep.call_count == PAGE_THROTTLE_RETRIES
+
+
+class TestFetchCaching:
+    """fetch_video_metadata()/fetch_transcript() — served from the fetch cache."""
+
+    @pytest.fixture(autouse=True)
+    def configured_cache(self, tmp_path):
+        fetch_cache.configure(str(tmp_path / "fetch_cache.sqlite3"))
+        yield fetch_cache
+        fetch_cache.configure(None)
+
+    @patch("services.youtube_service._fetch_video_metadata_uncached")
+    def test_metadata_fetched_once(self, mock_fetch):
+        mock_fetch.return_value = {"video_id": "dQw4w9WgXcQ", "title": "T"}
+        assert fetch_video_metadata("dQw4w9WgXcQ")["title"] == "T"
+        assert fetch_video_metadata("dQw4w9WgXcQ")["title"] == "T"
+        mock_fetch.assert_called_once()
+
+    @patch("services.youtube_service._fetch_transcript_uncached")
+    def test_missing_transcript_is_negatively_cached(self, mock_fetch):
+        mock_fetch.side_effect = TranscriptsDisabled("dQw4w9WgXcQ")
+        with pytest.raises(TranscriptsDisabled):
+            fetch_transcript("dQw4w9WgXcQ")
+        with pytest.raises(TranscriptUnavailableError):
+            fetch_transcript("dQw4w9WgXcQ")
+        mock_fetch.assert_called_once()
+
+    @patch("services.youtube_service._fetch_video_metadata_uncached")
+    def test_unavailable_video_is_negatively_cached(self, mock_fetch):
+        mock_fetch.side_effect = DownloadError("ERROR: Video unavailable")
+        with pytest.raises(DownloadError):
+            fetch_video_metadata("dQw4w9WgXcQ")
+        with pytest.raises(VideoUnavailableError):
+            fetch_video_metadata("dQw4w9WgXcQ")
+        mock_fetch.assert_called_once()
+
+    @patch("services.youtube_service._fetch_video_metadata_uncached")
+    def test_transient_errors_are_not_cached(self, mock_fetch):
+        mock_fetch.side_effect = DownloadError("ERROR: HTTP Error 429: Too Many Requests")
+        for _ in range(2):
+            with pytest.raises(DownloadError):
+                fetch_video_metadata("dQw4w9WgXcQ")
+        assert mock_fetch.call_count == 2
+
+
+class _FakeSnippet:
+    def __init__(self, text: str) -> None:
+        self.start = 1.234
+        self.duration = 2.0
+        self.text = text
+
+
+class _FakeTrack:
+    """Stand-in for youtube_transcript_api.Transcript."""
+
+    def __init__(self, language_code: str, is_generated: bool = False, translatable=("fr",)):
+        self.language_code = language_code
+        self.language = language_code.upper()
+        self.is_generated = is_generated
+        self.translation_languages = [
+            type("Lang", (), {"language_code": c, "language": c.upper()}) for c in translatable
+        ]
+        self.is_translatable = bool(translatable)
+
+    def translate(self, language_code: str) -> "_FakeTrack":
+        return _FakeTrack(language_code, is_generated=True, translatable=())
+
+    def fetch(self) -> list[_FakeSnippet]:
+        return [_FakeSnippet(f"{self.language_code} text")]
+
+
+class _FakeTranscriptList:
+    def __init__(self, tracks: list[_FakeTrack]) -> None:
+        self.tracks = tracks
+
+    def __iter__(self):
+        return iter(self.tracks)
+
+    def find_transcript(self, language_codes):
+        for track in self.tracks:
+            if track.language_code in language_codes:
+                return track
+        raise NoTranscriptFound("dQw4w9WgXcQ", language_codes, None)
+
+
+class TestMultiLanguageTranscripts:
+    """fetch_transcript(lang)/list_transcript_languages() — one track listing per video."""
+
+    @pytest.fixture(autouse=True)
+    def fake_api(self):
+        _transcript_lists.clear()
+        with patch("youtube_transcript_api.YouTubeTranscriptApi") as mock_api:
+            mock_api.return_value.list.return_value = _FakeTranscriptList([
+                _FakeTrack("de", translatable=()),
+                _FakeTrack("en", is_generated=True),
+            ])
+            yield mock_api
+        _transcript_lists.clear()
+
+    def test_native_track(self):
+        assert fetch_transcript("dQw4w9WgXcQ", "de") == [
+            {"start": 1.23, "duration": 2.0, "text": "de text"}
+        ]
+
+    def test_translates_when_no_native_track(self):
+        assert fetch_transcript("dQw4w9WgXcQ", "fr")[0]["text"] == "fr text"
+
+    def test_untranslatable_language_raises(self):
+        with pytest.raises(NoTranscriptFound):
+            fetch_transcript("dQw4w9WgXcQ", "ja")
+
+    def test_default_language_is_never_translated(self, fake_api):
+        fake_api.return_value.list.return_value = _FakeTranscriptList([
+            _FakeTrack("ja", translatable=("en",)),
+        ])
+        with pytest.raises(NoTranscriptFound):
+            fetch_transcript("dQw4w9WgXcQ")
+
+    def test_track_list_requested_once(self, fake_api):
+        fetch_transcript("dQw4w9WgXcQ", "en")
+        fetch_transcript("dQw4w9WgXcQ", "fr")
+        list_transcript_languages("dQw4w9WgXcQ")
+        fake_api.return_value.list.assert_called_once_with("dQw4w9WgXcQ")
+
+    def test_lists_languages(self):
+        languages = list_transcript_languages("dQw4w9WgXcQ")
+        assert [t["language_code"] for t in languages["tracks"]] == ["de", "en"]
+        assert languages["translation_languages"] == [{"language_code": "fr", "language": "FR"}]
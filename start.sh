@@ -9,7 +9,13 @@ rm -f "$PIDS_FILE"
 
 echo "Starting backend (port 5001)..."
 cd "$SCRIPT_DIR/backend"
-uv run python app.py &
+# Prefer the gevent server (no thread per open /api/events stream) when the
+# gevent extra is installed: uv sync --extra gevent
+if uv run python -c "import gevent" >/dev/null 2>&1; then
+    uv run python serve.py &
+else
+    uv run python app.py &
+fi
 BACKEND_PID=$!
 echo "backend=$BACKEND_PID" >> "$PIDS_FILE"
 